@@ -0,0 +1,2 @@
+__git_hash__ = "7cee20a103e6b610f594f247f081b5d924f27807"
+__version__ = "7cee20a"
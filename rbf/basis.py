@@ -48,12 +48,14 @@ Publishing Co, 2007.
 '''
 from __future__ import division
 import logging
+import threading
 import weakref
 
 import sympy
 import numpy as np
 from scipy.sparse import csc_matrix
 from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
 from sympy.utilities.autowrap import ufuncify
 from sympy import lambdify
 
@@ -66,6 +68,17 @@ logger = logging.getLogger(__name__)
 # the method used to convert sympy expressions to numeric functions
 _SYMBOLIC_TO_NUMERIC_METHOD = 'ufuncify'
 
+# numeric functions that have been created for any RBF instance. These are
+# keyed by everything that determines the function, so that RBF instances
+# with the same definition (e.g., unpickled copies of an RBF) can share them
+# rather than repeating the symbolic differentiation and compilation
+_NUMERIC_FUNCTIONS = {}
+
+# lock for creating numeric functions. `ufuncify` changes the working
+# directory and names the modules it compiles with a global counter, so it is
+# not thread safe
+_NUMERIC_FUNCTIONS_LOCK = threading.Lock()
+
 
 def get_r():
     '''
@@ -333,6 +346,23 @@ class RBF(object):
         Symbolically differentiates the RBF and then converts the expression to
         a function which can be evaluated numerically.
         '''
+        with _NUMERIC_FUNCTIONS_LOCK:
+            # another thread may have created the function while this one was
+            # waiting for the lock
+            if diff not in self._cache:
+                self._create_numeric_function(diff)
+
+    def _create_numeric_function(self, diff):
+        '''
+        Creates the numeric function for `diff` and adds it to the cache. This
+        should only be called by `_add_diff_to_cache`, which holds the lock.
+        '''
+        key = (self.expr, self.tol, self.limits.get(diff), diff,
+               _SYMBOLIC_TO_NUMERIC_METHOD)
+        if key in _NUMERIC_FUNCTIONS:
+            self._cache[diff] = _NUMERIC_FUNCTIONS[key]
+            return
+
         logger.debug(
             'Creating a numerical function for the RBF %s with the derivative '
             '%s ...' % (self, str(diff)))
@@ -382,6 +412,7 @@ class RBF(object):
             raise ValueError()
 
         self._cache[diff] = func
+        _NUMERIC_FUNCTIONS[key] = func
         logger.debug('The numeric function has been created and cached')
 
     def clear_cache(self):
@@ -549,6 +580,7 @@ def clear_rbf_caches():
     '''
     Clear the caches of numerical functions for all the RBF instances
     '''
+    _NUMERIC_FUNCTIONS.clear()
     for inst in RBF._INSTANCES:
         if inst() is not None:
             inst().clear_cache()
@@ -572,6 +604,60 @@ def get_rbf(val):
             % (val, set(_PREDEFINED.keys())))
 
 
+def _sqdist_coeff(phi, eps):
+    '''
+    The Gaussian and squared exponential RBFs have the form `exp(a*r**2)`.
+    This returns `a` for those RBFs and None for any other RBF.
+    '''
+    if phi is ga:
+        return -eps**2
+    elif phi is se:
+        return -1.0/(2.0*eps**2)
+    else:
+        return None
+
+
+# dimension at which it becomes faster to compute squared distances with a
+# matrix product than with `cdist`
+_SQDIST_GEMM_MIN_DIM = 16
+
+
+def _sqdist(x, c):
+    '''
+    Returns the squared distances between each (N, D) point `x` and (M, D)
+    center `c`. For high dimensional points, this uses the identity
+    `|x - c|**2 = |x|**2 + |c|**2 - 2*x.c` so that most of the work is done
+    by a single matrix product. Negative values from rounding error are
+    clipped to zero.
+    '''
+    if x.shape[1] < _SQDIST_GEMM_MIN_DIM:
+        return cdist(x, c, 'sqeuclidean')
+
+    # the identity suffers from cancellation when the points are far from the
+    # origin, so shift them to be centered on `c` first
+    shift = c.mean(axis=0)
+    x = x - shift
+    c = c - shift
+    out = x.dot(c.T)
+    out *= -2.0
+    out += np.einsum('ij,ij->i', x, x)[:, None]
+    out += np.einsum('ij,ij->i', c, c)[None, :]
+    np.maximum(out, 0.0, out=out)
+    return out
+
+
+def _sqdist_kernel(x, c, coeff):
+    '''
+    Evaluates `exp(coeff*r**2)` for each (N, D) point `x` and (M, D) center
+    `c`. This is computed from the squared distances between `x` and `c`,
+    which is faster than evaluating the numerical function for an RBF.
+    '''
+    out = _sqdist(x, c)
+    out *= coeff
+    np.exp(out, out=out)
+    return out
+
+
 def set_symbolic_to_numeric_method(method):
     '''
     Sets the method that all RBF instances will use for converting sympy
@@ -325,7 +325,7 @@ import scipy.sparse as sp
 import rbf.poly
 import rbf.basis
 import rbf.linalg
-from rbf.utils import assert_shape, get_arg_count
+from rbf.utils import assert_shape, get_arg_count, map_chunks
 from rbf.linalg import (as_array, as_sparse_or_array,
                         is_positive_definite, PosDefSolver,
                         PartitionedPosDefSolver)
@@ -495,14 +495,17 @@ def sample(mu, cov, use_cholesky=False, count=None):
         # eigenvalues. If `cov` is sparse then begrudgingly make it dense.
         cov = as_array(cov)
         vals, vecs = np.linalg.eigh(cov)
-        keep = (vals > 0.0)
-        vals = np.sqrt(vals[keep])
-        vecs = vecs[:, keep]
+        # the eigenvalues are in ascending order, so the positive eigenvalues
+        # and their eigenvectors can be sliced out without copying
+        start = np.searchsorted(vals, 0.0, side='right')
+        vals = np.sqrt(vals[start:])
+        vecs = vecs[:, start:]
         if count is None:
-            w = np.random.normal(0.0, vals)
+            w = vals*np.random.normal(0.0, 1.0, vals.shape[0])
             u = mu + vecs.dot(w)
         else:
-            w = np.random.normal(0.0, vals[:, None].repeat(count, axis=1))
+            w = np.random.normal(0.0, 1.0, (vals.shape[0], count))
+            w *= vals[:, None]
             u = (mu[:, None] + vecs.dot(w)).T
 
     return u
@@ -649,6 +652,9 @@ def outliers(d, dsigma, pcov, pmu=None, pvecs=None, tol=4.0, maxitr=50):
         pvecs = np.asarray(pvecs, dtype=float)
         assert_shape(pvecs, (n, None), 'pvecs')
 
+    # the data variances and residuals do not change between iterations
+    dvar = dsigma**2
+    pres = d - pmu
     # Total number of outlier detection iterations completed thus far
     itr = 0
     inliers = np.ones(n, dtype=bool)
@@ -656,21 +662,25 @@ def outliers(d, dsigma, pcov, pmu=None, pvecs=None, tol=4.0, maxitr=50):
         LOGGER.debug(
             'Starting iteration %d of outlier detection.' % (itr+1)
             )
-        # Remove rows and cols corresponding to the outliers
-        pcov_i = pcov[:, inliers][inliers, :]
-        pmu_i = pmu[inliers]
+        # Remove rows and cols corresponding to the outliers. The columns for
+        # the inliers are also used to evaluate the fit, so only gather them
+        # once
+        pcov_cols = pcov[:, inliers]
+        pcov_i = pcov_cols[inliers]
         pvecs_i = pvecs[inliers]
-        d_i = d[inliers]
-        dsigma_i = dsigma[inliers]
+        dvar_i = dvar[inliers]
         if sp.issparse(pcov):
-            pcov_i = (pcov_i + sp.diags(dsigma_i**2)).tocsc()
+            pcov_i = (pcov_i + sp.diags(dvar_i)).tocsc()
         else:
-            pcov_i = pcov_i + np.diag(dsigma_i**2)
+            # `pcov_i` is a copy, so the data variances can be added to its
+            # diagonal in place
+            idx = np.arange(pcov_i.shape[0])
+            pcov_i[idx, idx] += dvar_i
 
         # Find the mean of the posterior
         solver = PartitionedPosDefSolver(pcov_i, pvecs_i)
-        v1, v2 = solver.solve(d_i - pmu_i)
-        fit = pmu + pcov[:, inliers].dot(v1) + pvecs.dot(v2)
+        v1, v2 = solver.solve(pres[inliers])
+        fit = pmu + pcov_cols.dot(v1) + pvecs.dot(v2)
 
         # find new outliers based on the misfit
         res = np.abs(fit - d)/dsigma
@@ -710,7 +720,7 @@ def _func_wrapper(fin, ftype):
             if arg_count == 1:
                 # `fin` only takes one argument and is assumed to not be
                 # differentiable
-                if any(diff):
+                if diff.any():
                     raise ValueError(
                         'The %s function is not differentiable.' % ftype
                         )
@@ -730,7 +740,7 @@ def _func_wrapper(fin, ftype):
             if arg_count == 1:
                 # `fin` only takes one argument and is assumed to not be
                 # differentiable
-                if any(diff):
+                if diff.any():
                     raise ValueError(
                         'The basis function is not differentiable.'
                         )
@@ -750,7 +760,7 @@ def _func_wrapper(fin, ftype):
             if arg_count == 2:
                 # `fin` only takes two argument and is assumed to not be
                 # differentiable
-                if any(diff1) | any(diff2):
+                if diff1.any() | diff2.any():
                     raise ValueError(
                         'The covariance function is not differentiable.'
                         )
@@ -770,6 +780,42 @@ def _func_wrapper(fin, ftype):
     return fout
 
 
+def _prior_functions(gp):
+    '''
+    Returns the mean, covariance, and basis functions of `gp`, where missing
+    functions are replaced by `zero_mean`, `zero_covariance`, and
+    `empty_basis`.
+    '''
+    if gp._mean is None:
+        mean = zero_mean
+    else:
+        mean = gp._mean
+
+    if gp._covariance is None:
+        covariance = zero_covariance
+    else:
+        covariance = gp._covariance
+
+    if gp._basis is None:
+        basis = empty_basis
+    else:
+        basis = gp._basis
+
+    return mean, covariance, basis
+
+
+def _is_empty(gp):
+    '''
+    Returns True if `gp` has zero mean, zero covariance, and no basis
+    functions.
+    '''
+    out = ((gp._mean is None) &
+           (gp._covariance is None) &
+           (gp._variance is None) &
+           (gp._basis is None))
+    return out
+
+
 def _add(gp1, gp2):
     '''
     Returns a `GaussianProcess` which is the sum of two `GaussianProcess`.
@@ -786,6 +832,13 @@ def _add(gp1, gp2):
     else:
         dim = gp1.dim
 
+    # if either `GaussianProcess` is zero and has no basis functions, then the
+    # sum is just the other `GaussianProcess`
+    if _is_empty(gp2) & (dim == gp1.dim):
+        return gp1
+    elif _is_empty(gp1) & (dim == gp2.dim):
+        return gp2
+
     if gp2._mean is None:
         added_mean = gp1._mean
     elif gp1._mean is None:
@@ -795,14 +848,30 @@ def _add(gp1, gp2):
             out = gp1._mean(x, diff) + gp2._mean(x, diff)
             return out
 
-    if gp2._variance is None:
-        added_variance = gp1._variance
-    elif gp1._variance is None:
-        added_variance = gp2._variance
+    if (gp1._variance is None) & (gp2._variance is None):
+        # the variance will be computed from the diagonals of the added
+        # covariance
+        added_variance = None
     else:
-        def added_variance(x, diff):
-            out = gp1._variance(x, diff) + gp2._variance(x, diff)
-            return out
+        # at least one of the `GaussianProcess` instances has a variance
+        # function. If the other has a covariance function but no variance
+        # function, then its variance needs to come from its covariance
+        variance1 = gp1._variance
+        if (variance1 is None) & (gp1._covariance is not None):
+            variance1 = naive_variance_constructor(gp1._covariance)
+
+        variance2 = gp2._variance
+        if (variance2 is None) & (gp2._covariance is not None):
+            variance2 = naive_variance_constructor(gp2._covariance)
+
+        if variance2 is None:
+            added_variance = variance1
+        elif variance1 is None:
+            added_variance = variance2
+        else:
+            def added_variance(x, diff):
+                out = variance1(x, diff) + variance2(x, diff)
+                return out
 
     if gp2._covariance is None:
         added_covariance = gp1._covariance
@@ -842,6 +911,15 @@ def _scale(gp, c):
     '''
     Returns a scaled `GaussianProcess`.
     '''
+    if c == 1.0:
+        return gp
+
+    if c == 0.0:
+        # the basis functions are not scaled, so they are all that remains
+        out = GaussianProcess(basis=gp._basis, dim=gp.dim, wrap=False)
+        return out
+
+    c2 = c**2
     if gp._mean is None:
         scaled_mean = None
     else:
@@ -853,14 +931,14 @@ def _scale(gp, c):
         scaled_variance = None
     else:
         def scaled_variance(x, diff):
-            out = c**2*gp._variance(x, diff)
+            out = c2*gp._variance(x, diff)
             return out
 
     if gp._covariance is None:
         scaled_covariance = None
     else:
         def scaled_covariance(x1, x2, diff1, diff2):
-            out = c**2*gp._covariance(x1, x2, diff1, diff2)
+            out = c2*gp._covariance(x1, x2, diff1, diff2)
             return out
 
     out = GaussianProcess(
@@ -921,10 +999,9 @@ def _condition(gp, y, d, dcov, dvecs, ddiff, build_inverse):
     '''
     Returns a conditioned `GaussianProcess`.
     '''
-    if gp._mean is None:
-        prior_mean = zero_mean
-    else:
-        prior_mean = gp._mean
+    # `prior_mean` is left as None for zero mean processes so that the zero
+    # vectors never need to be allocated
+    prior_mean = gp._mean
 
     if gp._covariance is None:
         prior_covariance = zero_covariance
@@ -941,16 +1018,27 @@ def _condition(gp, y, d, dcov, dvecs, ddiff, build_inverse):
     else:
         prior_basis = gp._basis
 
-    # covariance of the observation points
-    cov = dcov + prior_covariance(y, y, ddiff, ddiff)
+    # covariance of the observation points. `dcov` is None if the data are
+    # noise free
+    cov = prior_covariance(y, y, ddiff, ddiff)
+    if dcov is not None:
+        cov = cov + dcov
+
     cov = as_sparse_or_array(cov)
 
     # residual at the observation points
-    res = d - prior_mean(y, ddiff)
+    if prior_mean is None:
+        res = d
+    else:
+        res = d - prior_mean(y, ddiff)
 
     # basis functions at the observation points
     vecs = prior_basis(y, ddiff)
-    if dvecs.shape[1] != 0:
+    # number of prior basis functions and the total number of basis functions
+    # including those for the data noise
+    m = vecs.shape[1]
+    p = m + dvecs.shape[1]
+    if p != m:
         vecs = np.hstack((vecs, dvecs))
 
     solver = PartitionedPosDefSolver(
@@ -960,34 +1048,59 @@ def _condition(gp, y, d, dcov, dvecs, ddiff, build_inverse):
     # precompute these vectors which are used for `posterior_mean`
     v1, v2 = solver.solve(res)
 
+    # the data noise basis functions are zero away from the observation points
+    # so only the coefficients for the prior basis functions are needed
+    v2 = v2[:m]
+
     del res, cov, vecs
 
+    def padded_basis_T(x, diff):
+        # returns the transposed basis functions at `x` padded with zeros for
+        # the data noise basis functions
+        vecs_x = prior_basis(x, diff)
+        if p == m:
+            return vecs_x.T
+
+        out = np.zeros((p, x.shape[0]), dtype=float)
+        out[:m] = vecs_x.T
+        return out
+
     def posterior_mean(x, diff):
-        mu_x = prior_mean(x, diff)
         cov_xy = prior_covariance(x, y, diff, ddiff)
         vecs_x = prior_basis(x, diff)
-        if dvecs.shape[1] != 0:
-            pad = np.zeros((x.shape[0], dvecs.shape[1]), dtype=float)
-            vecs_x = np.hstack((vecs_x, pad))
+        out = np.asarray(cov_xy.dot(v1))
+        out += vecs_x.dot(v2)
+        if prior_mean is not None:
+            out += prior_mean(x, diff)
 
-        out = mu_x + cov_xy.dot(v1) + vecs_x.dot(v2)
         return out
 
     def posterior_covariance(x1, x2, diff1, diff2):
         cov_x1x2 = prior_covariance(x1, x2, diff1, diff2)
         cov_x1y = prior_covariance(x1, y, diff1, ddiff)
-        cov_x2y = prior_covariance(x2, y, diff2, ddiff)
-        vecs_x1 = prior_basis(x1, diff1)
-        vecs_x2 = prior_basis(x2, diff2)
-        if dvecs.shape[1] != 0:
-            pad = np.zeros((x1.shape[0], dvecs.shape[1]), dtype=float)
-            vecs_x1 = np.hstack((vecs_x1, pad))
-
-            pad = np.zeros((x2.shape[0], dvecs.shape[1]), dtype=float)
-            vecs_x2 = np.hstack((vecs_x2, pad))
-
-        m1, m2 = solver.solve(cov_x2y.T, vecs_x2.T)
-        out = cov_x1x2 - cov_x1y.dot(m1) - vecs_x1.dot(m2)
+        if build_inverse:
+            # use full solves, which go through the inverse once the solver
+            # has built it
+            cov_x2y = prior_covariance(x2, y, diff2, ddiff)
+            vecs_x2 = padded_basis_T(x2, diff2)
+            m1, m2 = solver.solve(cov_x2y.T, vecs_x2)
+            vecs_x1 = prior_basis(x1, diff1)
+            out = cov_x1x2 - cov_x1y.dot(m1) - vecs_x1.dot(m2[:m])
+            out = np.asarray(out)
+            return out
+
+        vecs_x1 = padded_basis_T(x1, diff1)
+        c1, d1 = solver.solve_L(cov_x1y.T, vecs_x1)
+        if (x1 is x2) and np.array_equal(diff1, diff2):
+            # the covariance of `x1` with itself is being computed, so there
+            # is no need to evaluate the prior at `x2`
+            c2, d2 = c1, d1
+        else:
+            cov_x2y = prior_covariance(x2, y, diff2, ddiff)
+            vecs_x2 = padded_basis_T(x2, diff2)
+            c2, d2 = solver.solve_L(cov_x2y.T, vecs_x2)
+
+        out = cov_x1x2 - c1.T.dot(c2) + d1.T.dot(d2)
         # `out` may either be a matrix or array depending on whether cov_x1x2
         # is sparse or dense. Make the output consistent by converting to array
         out = np.asarray(out)
@@ -996,20 +1109,26 @@ def _condition(gp, y, d, dcov, dvecs, ddiff, build_inverse):
     def posterior_variance(x, diff):
         var_x = prior_variance(x, diff)
         cov_xy = prior_covariance(x, y, diff, ddiff)
-        vecs_x = prior_basis(x, diff)
-        if dvecs.shape[1] != 0:
-            pad = np.zeros((x.shape[0], dvecs.shape[1]), dtype=float)
-            vecs_x = np.hstack((vecs_x, pad))
-
-        m1, m2 = solver.solve(cov_xy.T, vecs_x.T)
-        # Efficiently get the diagonals of C_xy.dot(mat1) and p_x.dot(mat2)
-        if sp.issparse(cov_xy):
-            diag1 = cov_xy.multiply(m1.T).sum(axis=1).A[:, 0]
-        else:
-            diag1 = np.einsum('ij, ji -> i', cov_xy, m1)
+        vecs_x = padded_basis_T(x, diff)
+        if build_inverse:
+            m1, m2 = solver.solve(cov_xy.T, vecs_x)
+            # efficiently get the diagonals of `cov_xy.dot(m1)` and
+            # `vecs_x.T.dot(m2)`
+            if sp.issparse(cov_xy):
+                diag1 = cov_xy.multiply(m1.T).sum(axis=1).A[:, 0]
+            else:
+                diag1 = np.einsum('ij, ji -> i', cov_xy, m1)
 
-        diag2 = np.einsum('ij, ji -> i', vecs_x, m2)
-        out = var_x - diag1 - diag2
+            diag2 = np.einsum('ij, ij -> j', vecs_x, m2)
+            out = var_x - diag1 - diag2
+            return out
+
+        # the posterior variance only needs the diagonals of the quadratic
+        # form, which are the squared column norms of the half solves
+        c, e = solver.solve_L(cov_xy.T, vecs_x)
+        out = (var_x
+               - np.einsum('ij, ij -> j', c, c)
+               + np.einsum('ij, ij -> j', e, e))
         return out
 
     out = GaussianProcess(
@@ -1204,7 +1323,8 @@ class GaussianProcess:
             Observed values at `y`.
 
         dcov : (N, N) array or sparse matrix, optional
-            Covariance of the data noise. Defaults to a dense array of zeros.
+            Covariance of the data noise. If not given, the data are assumed
+            to be noise free.
 
         dvecs : (N, P) array, optional
             Data noise basis vectors. The data noise is assumed to contain some
@@ -1216,7 +1336,10 @@ class GaussianProcess:
 
         build_inverse : bool, optional
             Whether to construct the inverse matrices rather than just the
-            factors.
+            factors. The inverse is built once enough points have been
+            evaluated for it to pay for itself, and it is then used for the
+            posterior covariance and variance. This can be faster when the
+            conditioned `GaussianProcess` is evaluated at many points.
 
         Returns
         -------
@@ -1230,9 +1353,7 @@ class GaussianProcess:
         d = np.asarray(d, dtype=float)
         assert_shape(d, (n,), 'd')
 
-        if dcov is None:
-            dcov = np.zeros((n, n), dtype=float)
-        else:
+        if dcov is not None:
             dcov = as_sparse_or_array(dcov)
             assert_shape(dcov, (n, n), 'dcov')
 
@@ -1376,12 +1497,19 @@ class GaussianProcess:
         (N, M) array or sparse matrix
 
         '''
+        # keep track of whether `x1` and `x2` are the same so that the
+        # covariance function can avoid redundant evaluations
+        same_x = x1 is x2
+
         x1 = np.asarray(x1, dtype=float)
         assert_shape(x1, (None, self.dim), 'x1')
         dim = x1.shape[1]
 
-        x2 = np.asarray(x2, dtype=float)
-        assert_shape(x2, (None, dim), 'x2')
+        if same_x:
+            x2 = x1
+        else:
+            x2 = np.asarray(x2, dtype=float)
+            assert_shape(x2, (None, dim), 'x2')
 
         if diff1 is None:
             diff1 = np.zeros(dim, dtype=int)
@@ -1402,7 +1530,7 @@ class GaussianProcess:
 
         return out
 
-    def __call__(self, x, chunk_size=100):
+    def __call__(self, x, chunk_size=100, workers=None):
         '''
         Returns the mean and standard deviation of the Gaussian process.
 
@@ -1414,6 +1542,11 @@ class GaussianProcess:
         chunk_size : int, optional
             Break `x` into chunks with this size for evaluation.
 
+        workers : int, optional
+            Number of threads used to evaluate the chunks. Most of the work
+            for each chunk is done in numpy and LAPACK, which release the GIL.
+            By default, the chunks are evaluated serially.
+
         Returns
         -------
         (N,) array
@@ -1429,13 +1562,35 @@ class GaussianProcess:
 
         diff = np.zeros(dim, dtype=int)
 
-        out_mu = np.empty(n, dtype=float)
+        # `x` has already been checked, so get the underlying mean and
+        # variance functions once rather than going through the `mean` and
+        # `variance` methods for each chunk
+        mean = self._mean
+        if self._variance is not None:
+            variance = self._variance
+        elif self._covariance is not None:
+            variance = naive_variance_constructor(self._covariance)
+        else:
+            variance = zero_variance
+
+        if mean is None:
+            # the mean is zero, so there is nothing to evaluate for each chunk
+            out_mu = np.zeros(n, dtype=float)
+        else:
+            out_mu = np.empty(n, dtype=float)
+
         out_sigma = np.empty(n, dtype=float)
-        for start in range(0, n, chunk_size):
+
+        def evaluate_chunk(start):
+            # each chunk writes to a disjoint part of the output arrays
             stop = start + chunk_size
-            out_mu[start:stop] = self.mean(x[start:stop], diff)
-            out_sigma[start:stop] = np.sqrt(self.variance(x[start:stop], diff))
+            x_chunk = x[start:stop]
+            if mean is not None:
+                out_mu[start:stop] = mean(x_chunk, diff)
 
+            out_sigma[start:stop] = np.sqrt(variance(x_chunk, diff))
+
+        map_chunks(evaluate_chunk, n, chunk_size, workers=workers)
         return out_mu, out_sigma
 
     def log_likelihood(self, y, d, dcov=None, dvecs=None):
@@ -1455,8 +1610,8 @@ class GaussianProcess:
             Observed values at `y`.
 
         dcov : (N, N) array or sparse matrix, optional
-            Data covariance. If not given, this will be a dense matrix of
-            zeros.
+            Data covariance. If not given, the data are assumed to be noise
+            free.
 
         dvecs : (N, P) float array, optional
             Basis vectors for the noise. The data noise is assumed to contain
@@ -1474,9 +1629,7 @@ class GaussianProcess:
         d = np.asarray(d, dtype=float)
         assert_shape(d, (n,), 'd')
 
-        if dcov is None:
-            dcov = np.zeros((n, n), dtype=float)
-        else:
+        if dcov is not None:
             dcov = as_sparse_or_array(dcov)
             assert_shape(dcov, (n, n), 'dcov')
 
@@ -1486,9 +1639,17 @@ class GaussianProcess:
             dvecs = np.asarray(dvecs, dtype=float)
             assert_shape(dvecs, (n, None), 'dvecs')
 
-        mu = self.mean(y)
-        cov = as_sparse_or_array(dcov + self.covariance(y, y))
-        vecs = np.hstack((self.basis(y), dvecs))
+        # `y` has already been checked, so evaluate the underlying functions
+        # directly
+        mean, covariance, basis = _prior_functions(self)
+        diff = np.zeros(dim, dtype=int)
+        mu = mean(y, diff)
+        cov = covariance(y, y, diff, diff)
+        if dcov is not None:
+            cov = cov + dcov
+
+        cov = as_sparse_or_array(cov)
+        vecs = np.hstack((basis(y, diff), dvecs))
 
         out = log_likelihood(d, mu, cov, vecs=vecs)
         return out
@@ -1497,8 +1658,14 @@ class GaussianProcess:
         '''
         Draws a random sample from the Gaussian process.
         '''
-        mu = self.mean(x)
-        cov = self.covariance(x, x)
+        x = np.asarray(x, dtype=float)
+        assert_shape(x, (None, self.dim), 'x')
+        dim = x.shape[1]
+
+        mean, covariance, _ = _prior_functions(self)
+        diff = np.zeros(dim, dtype=int)
+        mu = mean(x, diff)
+        cov = covariance(x, x, diff, diff)
         out = sample(mu, cov, use_cholesky=use_cholesky, count=count)
         return out
 
@@ -1543,9 +1710,11 @@ class GaussianProcess:
         dsigma = np.asarray(dsigma, dtype=float)
         assert_shape(dsigma, (n,), 'dsigma')
 
-        pcov = self.covariance(x, x)
-        pmu = self.mean(x)
-        pvecs = self.basis(x)
+        mean, covariance, basis = _prior_functions(self)
+        diff = np.zeros(dim, dtype=int)
+        pcov = covariance(x, x, diff, diff)
+        pmu = mean(x, diff)
+        pvecs = basis(x, diff)
         out = outliers(
             d, dsigma, pcov, pmu=pmu, pvecs=pvecs, tol=tol, maxitr=maxitr
             )
@@ -1556,7 +1725,13 @@ class GaussianProcess:
         '''
         Tests if the covariance function evaluated at `x` is positive definite.
         '''
-        cov = self.covariance(x, x)
+        x = np.asarray(x, dtype=float)
+        assert_shape(x, (None, self.dim), 'x')
+        dim = x.shape[1]
+
+        _, covariance, _ = _prior_functions(self)
+        diff = np.zeros(dim, dtype=int)
+        cov = covariance(x, x, diff, diff)
         out = is_positive_definite(cov)
         return out
 
@@ -1596,15 +1771,37 @@ def gpiso(phi, eps, var, dim=None):
     '''
     phi = rbf.basis.get_rbf(phi)
 
+    # The squared exponential and Gaussian RBFs have the form exp(a*r**2).
+    # Their covariance matrices can be evaluated more efficiently from the
+    # squared distances between points when there are no derivatives.
+    sqdist_coeff = rbf.basis._sqdist_coeff(phi, eps)
+
+    # the covariance coefficient is `var` or `-var` depending on whether the
+    # total derivative order of the second argument is even or odd
+    parity_coeffs = (var, -var)
+    # the variance only depends on `diff`, so cache it for each `diff`
+    center_values = {}
+
     def isotropic_covariance(x1, x2, diff1, diff2):
+        if (sqdist_coeff is not None) and not (diff1.any() or diff2.any()):
+            out = rbf.basis._sqdist_kernel(x1, x2, sqdist_coeff)
+            out *= var
+            return out
+
         diff = diff1 + diff2
-        coeff = var*(-1)**sum(diff2)
-        out = coeff*phi(x1, x2, eps=eps, diff=diff)
+        coeff = parity_coeffs[diff2.sum() % 2]
+        out = phi(x1, x2, eps=eps, diff=diff)
+        out *= coeff
         return out
 
     def isotropic_variance(x, diff):
-        coeff = var*(-1)**sum(diff)
-        value = coeff*phi.center_value(eps=eps, diff=2*diff)
+        key = tuple(diff)
+        value = center_values.get(key)
+        if value is None:
+            coeff = parity_coeffs[diff.sum() % 2]
+            value = coeff*phi.center_value(eps=eps, diff=2*diff)
+            center_values[key] = value
+
         out = np.full(x.shape[0], value)
         return out
 
@@ -1700,5 +1897,21 @@ def gpgibbs(lengthscale, sigma, delta=1e-4):
         out = sigma**2*coeff*np.exp(exponent)
         return out
 
-    out = GaussianProcess(covariance=gibbs_covariance, wrap=False)
+    def gibbs_variance(x, diff):
+        '''
+        variance function for the Gibbs Gaussian process.
+        '''
+        if not diff.any():
+            # the variance is constant when there are no derivatives
+            out = np.full(x.shape[0], sigma**2, dtype=float)
+        else:
+            out = naive_variance_constructor(gibbs_covariance)(x, diff)
+
+        return out
+
+    out = GaussianProcess(
+        covariance=gibbs_covariance,
+        variance=gibbs_variance,
+        wrap=False
+        )
     return out
@@ -61,7 +61,7 @@ import rbf.basis
 from rbf.poly import monomial_count, mvmonos
 from rbf.basis import get_rbf, SparseRBF
 from rbf.utils import assert_shape, KDTree
-from rbf.linalg import PartitionedSolver
+from rbf.linalg import PartitionedSolver, PartitionedPosDefSolver
 
 logger = logging.getLogger(__name__)
 
@@ -92,8 +92,10 @@ class RBFInterpolant(object):
     y : (N, D) array
         Observation points
 
-    d : (N,) array
-        Observed values at `y`
+    d : (N, ...) array
+        Observed values at `y`. If this has more than one dimension, then an
+        interpolant is fit to each component of the trailing dimensions. All
+        of the components share one factorization of the system of equations.
 
     sigma : float or (N,) array, optional
         Smoothing parameter. Setting this to 0 causes the interpolant to
@@ -130,7 +132,11 @@ class RBFInterpolant(object):
         ny, ndim = y.shape
 
         d = np.asarray(d, dtype=float)
-        assert_shape(d, (ny,), 'd')
+        assert_shape(d, (ny, ...), 'd')
+        # flatten the trailing dimensions of `d` so that each component is a
+        # column in the right-hand side of the system of equations
+        data_shape = d.shape[1:]
+        d = d.reshape((ny, -1))
 
         if np.isscalar(sigma):
             sigma = np.full(ny, sigma, dtype=float)
@@ -160,7 +166,12 @@ class RBFInterpolant(object):
         y = y - center
         # Build the system of equations and solve for the RBF and mononomial
         # coefficients
-        Kyy = phi(y, y, eps=eps)
+        sqdist_coeff = rbf.basis._sqdist_coeff(phi, eps)
+        if sqdist_coeff is None:
+            Kyy = phi(y, y, eps=eps)
+        else:
+            Kyy = rbf.basis._sqdist_kernel(y, y, sqdist_coeff)
+
         if sp.issparse(Kyy):
             Kyy = sp.csc_matrix(Kyy + sp.diags(sigma**2))
         else:
@@ -173,15 +184,30 @@ class RBFInterpolant(object):
                 'The polynomial order is too high. The number of monomials, '
                 '%d, exceeds the number of observations, %d' % (nmonos, ny))
 
-        phi_coeff, poly_coeff = PartitionedSolver(Kyy, Py).solve(d)
+        if sp.issparse(Kyy) | (phi in _MIN_ORDER):
+            solver = PartitionedSolver(Kyy, Py)
+            phi_coeff, poly_coeff = solver.solve(d)
+
+        else:
+            # `phi` is positive definite (or user-defined), so try solving the
+            # system with a Cholesky decomposition of `Kyy` and its Schur
+            # complement. Fall back to an LU factorization of the full system
+            # if `Kyy` turns out to not be numerically positive definite.
+            try:
+                solver = PartitionedPosDefSolver(Kyy, Py)
+            except np.linalg.LinAlgError:
+                solver = PartitionedSolver(Kyy, Py)
+
+            phi_coeff, poly_coeff = solver.solve(d)
 
         self.y = y
         self.phi = phi
         self.eps = eps
         self.order = order
         self.center = center
-        self.phi_coeff = phi_coeff
-        self.poly_coeff = poly_coeff
+        self.phi_coeff = phi_coeff.reshape((ny,) + data_shape)
+        self.poly_coeff = poly_coeff.reshape((nmonos,) + data_shape)
+        self.data_shape = data_shape
 
     def __call__(self, x, diff=None, chunk_size=1000):
         '''
@@ -201,7 +227,7 @@ class RBFInterpolant(object):
 
         Returns
         -------
-        (N,) float array
+        (N, ...) float array
 
         '''
         x = np.asarray(x,dtype=float)
@@ -209,7 +235,7 @@ class RBFInterpolant(object):
         nx = x.shape[0]
 
         if chunk_size is not None:
-            out = np.zeros(nx, dtype=float)
+            out = np.zeros((nx,) + self.data_shape, dtype=float)
             for start in range(0, nx, chunk_size):
                 stop = start + chunk_size
                 out[start:stop] = self(x[start:stop], diff, None)
@@ -217,9 +243,21 @@ class RBFInterpolant(object):
             return out
 
         x = x - self.center
-        Kxy = self.phi(x, self.y, eps=self.eps, diff=diff)
+        sqdist_coeff = rbf.basis._sqdist_coeff(self.phi, self.eps)
+        if (sqdist_coeff is not None) & ((diff is None) or (not np.any(diff))):
+            Kxy = rbf.basis._sqdist_kernel(x, self.y, sqdist_coeff)
+        else:
+            Kxy = self.phi(x, self.y, eps=self.eps, diff=diff)
+
         Px = mvmonos(x, self.order, diff=diff)
-        out = Kxy.dot(self.phi_coeff) + Px.dot(self.poly_coeff)
+        # evaluate all the components of the data with one matrix product. The
+        # number of components is given explicitly because the coefficient
+        # arrays may be empty
+        ncomp = int(np.prod(self.data_shape))
+        phi_coeff = self.phi_coeff.reshape((Kxy.shape[1], ncomp))
+        poly_coeff = self.poly_coeff.reshape((Px.shape[1], ncomp))
+        out = Kxy.dot(phi_coeff) + Px.dot(poly_coeff)
+        out = out.reshape((nx,) + self.data_shape)
         return out
 
 
@@ -233,8 +271,11 @@ class KNearestRBFInterpolant(object):
     y : (N, D) array
         Observation points
 
-    d : (N,) array
-        Observed values at `y`
+    d : (N, ...) array
+        Observed values at `y`. If this has more than one dimension, then an
+        interpolant is fit to each component of the trailing dimensions. All
+        of the components share one factorization of the system of equations
+        for each neighborhood.
 
     sigma : float or (N,) array, optional
         Smoothing parameter. Setting this to 0 causes the interpolant to
@@ -275,7 +316,7 @@ class KNearestRBFInterpolant(object):
         ny, ndim = y.shape
 
         d = np.asarray(d, dtype=float)
-        assert_shape(d, (ny,), 'd')
+        assert_shape(d, (ny, ...), 'd')
 
         if np.isscalar(sigma):
             sigma = np.full(ny, sigma, dtype=float)
@@ -320,6 +361,7 @@ class KNearestRBFInterpolant(object):
         self.phi = phi
         self.order = order
         self.tree = tree
+        self.data_shape = d.shape[1:]
 
     def __call__(self, x, diff=None, chunk_size=100):
         '''
@@ -339,7 +381,7 @@ class KNearestRBFInterpolant(object):
 
         Returns
         -------
-        (N,) float array
+        (N, ...) float array
 
         '''
         x = np.asarray(x, dtype=float)
@@ -347,7 +389,7 @@ class KNearestRBFInterpolant(object):
         nx = x.shape[0]
 
         if chunk_size is not None:
-            out = np.zeros(nx, dtype=float)
+            out = np.zeros((nx,) + self.data_shape, dtype=float)
             for start in range(0, nx, chunk_size):
                 stop = start + chunk_size
                 out[start:stop] = self(x[start:stop], diff, None)
@@ -362,8 +404,11 @@ class KNearestRBFInterpolant(object):
         # coefficients once for each neighborhood
         nbr, inv = np.unique(np.sort(nbr, axis=1), return_inverse=True, axis=0)
         nnbr = nbr.shape[0]
-        # Get the observation data for each neighborhood
-        y, d, sigma = self.y[nbr], self.d[nbr], self.sigma[nbr]
+        # Get the observation data for each neighborhood. The trailing
+        # dimensions of `d` are flattened so that each component is a column
+        # in the right-hand side for the neighborhood
+        y, sigma = self.y[nbr], self.sigma[nbr]
+        d = self.d.reshape((self.y.shape[0], -1))[nbr]
         # shift the centers of each neighborhood to zero for numerical
         # stability
         centers = y.mean(axis=1)
@@ -373,15 +418,18 @@ class KNearestRBFInterpolant(object):
         Kyy = self.phi(y, y, eps=self.eps)
         Kyy[:, range(self.k), range(self.k)] += sigma**2
         Py = mvmonos(y, self.order)
-        PyT = np.transpose(Py, (0, 2, 1))
         nmonos = Py.shape[2]
-        Z = np.zeros((nnbr, nmonos, nmonos), dtype=float)
-        LHS = np.block([[Kyy, Py], [PyT, Z]])
-        # build the right-hand-side data vector consisting of the observations
-        # for each neighborhood and extra zeros
-        z = np.zeros((nnbr, nmonos), dtype=float)
-        rhs = np.hstack((d, z))
-        # solve for the RBF and polynomial coefficients for each neighborhood
+        # write the blocks directly into one array rather than using np.block
+        LHS = np.zeros((nnbr, self.k + nmonos, self.k + nmonos), dtype=float)
+        LHS[:, :self.k, :self.k] = Kyy
+        LHS[:, :self.k, self.k:] = Py
+        LHS[:, self.k:, :self.k] = np.transpose(Py, (0, 2, 1))
+        # build the right-hand-side data consisting of the observations for
+        # each neighborhood and extra zeros
+        rhs = np.zeros((nnbr, self.k + nmonos, d.shape[2]), dtype=float)
+        rhs[:, :self.k] = d
+        # solve for the RBF and polynomial coefficients for each neighborhood.
+        # All the components of the data are solved for with one factorization
         coeff = np.linalg.solve(LHS, rhs)
         # expand the arrays from having one entry per neighborhood to one entry
         # per interpolation point
@@ -394,5 +442,9 @@ class KNearestRBFInterpolant(object):
         poly_coeff = coeff[:, self.k:]
         Kxy = self.phi(x[:, None], y, eps=self.eps, diff=diff)[:, 0]
         Px = mvmonos(x, self.order, diff=diff)
-        out = (Kxy*phi_coeff).sum(axis=1) + (Px*poly_coeff).sum(axis=1)
+        # take the row-wise dot products without forming the element-wise
+        # products as temporary arrays
+        out = (np.einsum('ij, ijk -> ik', Kxy, phi_coeff) +
+               np.einsum('ij, ijk -> ik', Px, poly_coeff))
+        out = out.reshape((nx,) + self.data_shape)
         return out
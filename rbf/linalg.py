@@ -4,12 +4,16 @@ applications. Most functions in this module can take either scipy sparse
 matrices or numpy arrays as input
 '''
 import logging
+import threading
 import warnings
 
 import numpy as np
 import scipy.sparse as sp
 import scipy.sparse.linalg as spla
-from scipy.linalg.lapack import dpotrf, dpotrs, dtrtrs, dgetrf, dgetrs
+from scipy.linalg.lapack import (
+    dpotrf, dpotrs, dtrtrs, dgetrf, dgetrs, spotrf, spotrs, strtrs
+    )
+from scipy.linalg.blas import dsyrk
 
 from rbf.sputils import row_norms, divide_rows
 
@@ -30,14 +34,16 @@ except ImportError:
 ## Wrappers for low level LAPACK functions. These are all a few microseconds
 ## faster than their corresponding functions in scipy.linalg
 ###############################################################################
-def _lu(A):
+def _lu(A, overwrite_a=False):
     '''
-    Computes the LU factorization of `A` using `dgetrf`
+    Computes the LU factorization of `A` using `dgetrf`. If `overwrite_a` is
+    True and `A` is a Fortran ordered float array, then the factorization is
+    done in place.
     '''
     if A.shape == (0, 0):
         return (np.zeros((0, 0), dtype=float), np.zeros((0,), dtype=np.int32))
 
-    fac, piv, info = dgetrf(A)
+    fac, piv, info = dgetrf(A, overwrite_a=overwrite_a)
     if info < 0:
         raise ValueError('the %s-th argument had an illegal value' % -info)
     elif info > 0:
@@ -48,12 +54,14 @@ def _lu(A):
 
 def _cholesky(A, lower=True):
     '''
-    Computes the Cholesky decomposition of `A` using `dpotrf`
+    Computes the Cholesky decomposition of `A` using `dpotrf`, or `spotrf` if
+    `A` is a single precision array
     '''
     if A.shape == (0, 0):
-        return np.zeros((0, 0), dtype=float)
+        return np.zeros((0, 0), dtype=A.dtype)
 
-    L, info = dpotrf(A, lower=lower)
+    potrf = spotrf if A.dtype == np.float32 else dpotrf
+    L, info = potrf(A, lower=lower)
     if info < 0:
         raise ValueError('The %s-th argument has an illegal value.' % -info)
     elif info > 0:
@@ -63,42 +71,53 @@ def _cholesky(A, lower=True):
     return L
 
 
-def _solve_lu(fac, piv, b):
+def _solve_lu(fac, piv, b, overwrite_b=False):
     '''
-    Solves `Ax = b` given the LU factorization of `A` using `dgetrs`
+    Solves `Ax = b` given the LU factorization of `A` using `dgetrs`. If
+    `overwrite_b` is True and `b` is a Fortran ordered float array, then the
+    solution is written to `b`.
     '''
     if any(i == 0 for i in b.shape):
         return np.zeros(b.shape, dtype=float)
 
-    x, info = dgetrs(fac, piv, b)
+    x, info = dgetrs(fac, piv, b, overwrite_b=overwrite_b)
     if info < 0:
         raise ValueError('the %s-th argument had an illegal value' % -info)
 
     return x
 
 
-def _solve_cholesky(L, b, lower=True):
+def _solve_cholesky(L, b, lower=True, overwrite_b=False):
     '''
-    Solves `Ax = b` given the Cholesky decomposition of `A` using `dpotrs`
+    Solves `Ax = b` given the Cholesky decomposition of `A` using `dpotrs`, or
+    `spotrs` if `L` is single precision. If `overwrite_b` is True and `b` is a
+    Fortran ordered array with the same dtype as `L`, then the solution is
+    written to `b`.
     '''
     if any(i == 0 for i in b.shape):
-        return np.zeros(b.shape, dtype=float)
+        return np.zeros(b.shape, dtype=L.dtype)
 
-    x, info = dpotrs(L, b, lower=lower)
+    potrs = spotrs if L.dtype == np.float32 else dpotrs
+    x, info = potrs(L, b, lower=lower, overwrite_b=overwrite_b)
     if info < 0:
         raise ValueError('The %s-th argument has an illegal value.' % -info)
 
     return x
 
 
-def _solve_triangular(L, b, lower=True):
+def _solve_triangular(L, b, lower=True, trans=False, overwrite_b=False):
     '''
-    Solves `Lx = b`  for a triangular `L` using `dtrtrs`
+    Solves `Lx = b` for a triangular `L` using `dtrtrs`, or `strtrs` if `L` is
+    single precision. If `trans` is True, then this solves `L^T x = b`. If
+    `overwrite_b` is True and `b` is a Fortran ordered array with the same
+    dtype as `L`, then the solution is written to `b`.
     '''
     if any(i == 0 for i in b.shape):
-        return np.zeros(b.shape, dtype=float)
+        return np.zeros(b.shape, dtype=L.dtype)
 
-    x, info = dtrtrs(L, b, lower=lower)
+    trtrs = strtrs if L.dtype == np.float32 else dtrtrs
+    x, info = trtrs(L, b, lower=lower, trans=int(trans),
+                    overwrite_b=overwrite_b)
     if info < 0:
         raise ValueError('The %s-th argument had an illegal value' % -info)
     elif info > 0:
@@ -107,6 +126,17 @@ def _solve_triangular(L, b, lower=True):
     return x
 
 
+def _gram_lower(W):
+    '''
+    Computes `W^T W` using `dsyrk`. Only the lower triangle of the output is
+    filled in, which is all that `dpotrf` reads with `lower=True`.
+    '''
+    if any(i == 0 for i in W.shape):
+        return np.zeros((W.shape[1], W.shape[1]), dtype=float)
+
+    return dsyrk(1.0, W, trans=1, lower=1)
+
+
 #####################################################################
 def as_sparse_or_array(A, dtype=None, copy=False):
     '''
@@ -128,6 +158,12 @@ def as_array(A, dtype=None, copy=False):
     Return `A` as an array if it is not already. This properly handles when `A`
     is sparse.
     '''
+    # fast path for when `A` is already an array with the requested dtype,
+    # which is the common case for the solvers' `solve` methods
+    if (type(A) is np.ndarray) & (not copy):
+        if (dtype is None) or (A.dtype == dtype):
+            return A
+
     if sp.issparse(A):
         A = A.toarray()
 
@@ -135,6 +171,55 @@ def as_array(A, dtype=None, copy=False):
     return A
 
 
+def _inverse_from_factor(solver, n, block_size=1000):
+    '''
+    Returns the inverse of the (n, n) matrix factored by `solver`. The inverse
+    is built from blocks of columns of the identity matrix so that the full
+    identity matrix is never allocated.
+    '''
+    out = np.empty((n, n), dtype=float)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        I = np.zeros((n, stop - start), dtype=float)
+        I[range(start, stop), range(stop - start)] = 1.0
+        out[:, start:stop] = solver.solve(I)
+
+    return out
+
+
+def _init_lazy_inverse(solver, build_inverse):
+    '''
+    Sets the attributes that `_count_columns` uses to build the inverse for
+    `solver` lazily.
+    '''
+    solver._lazy_inverse = build_inverse
+    solver._inverse = None
+    # total number of right-hand side columns that have been solved for
+    solver._column_count = 0
+    # the solvers may be used from multiple threads, e.g., when evaluating a
+    # conditioned `GaussianProcess` with `workers`. This makes sure that the
+    # inverse is only built once
+    solver._inverse_lock = threading.Lock()
+
+
+def _count_columns(solver, b, size):
+    '''
+    Used by the solvers to build their inverses lazily. If `solver` was created
+    with `build_inverse=True`, this adds the number of right-hand side columns
+    in `b` to the count of columns that `solver` has solved for. Once the
+    count reaches `size`, which is when building the inverse pays for itself,
+    the inverse is built with `solver._make_inverse`.
+    '''
+    if solver._lazy_inverse & (solver._inverse is None):
+        with solver._inverse_lock:
+            # check again because another thread may have built the inverse
+            # while this one was waiting for the lock
+            if solver._inverse is None:
+                solver._column_count += int(np.prod(b.shape[1:]))
+                if solver._column_count >= size:
+                    solver._inverse = solver._make_inverse()
+
+
 class _SparseSolver:
     '''
     Sparse matrix solver using SuperLU
@@ -154,13 +239,13 @@ class _DenseSolver:
     '''
     Dense matrix solver using LAPACK LU factorization
     '''
-    def __init__(self, A):
-        fac, piv = _lu(A)
+    def __init__(self, A, overwrite_a=False):
+        fac, piv = _lu(A, overwrite_a=overwrite_a)
         self.fac = fac
         self.piv = piv
 
-    def solve(self, b):
-        return _solve_lu(self.fac, self.piv, b)
+    def solve(self, b, overwrite_b=False):
+        return _solve_lu(self.fac, self.piv, b, overwrite_b=overwrite_b)
 
 
 class Solver:
@@ -171,6 +256,11 @@ class Solver:
     ----------
     A : (n, n) array or sparse matrix
 
+    build_inverse : bool, optional
+        Whether to use the inverse of `A` for solves. The inverse is built
+        lazily, once the total number of right-hand side columns passed to
+        `solve` reaches `n`, which is when building it pays for itself.
+
     '''
     def __init__(self, A, build_inverse=False):
         A = as_sparse_or_array(A, dtype=float)
@@ -179,14 +269,13 @@ class Solver:
         else:
             self._solver = _DenseSolver(A)
 
-        if build_inverse:
-            I = np.eye(A.shape[0])
-            self._inverse = self._solver.solve(I)
-        else:
-            self._inverse = None
-
+        _init_lazy_inverse(self, build_inverse)
         self.n = A.shape[0]
 
+    def _make_inverse(self):
+        '''Builds the inverse of `A` from its factorization'''
+        return _inverse_from_factor(self._solver, self.n)
+
     def solve(self, b):
         '''
         solves `Ax = b` for `x`
@@ -201,6 +290,8 @@ class Solver:
 
         '''
         b = as_array(b, dtype=float)
+        _count_columns(self, b, self.n)
+
         if self._inverse is not None:
             return self._inverse.dot(b)
         else:
@@ -212,20 +303,30 @@ class _SparsePosDefSolver:
     Sparse positive definite matrix solver using CHOLMOD
 
     Factors the matrix as `LL^T = A`. Note that `L` is NOT necessarily a lower
-    triangular matrix
+    triangular matrix. `mode` is the CHOLMOD factorization mode, which can be
+    "auto", "simplicial", or "supernodal". With "auto", CHOLMOD uses the
+    supernodal method when its symbolic analysis predicts at least 40 flops
+    per nonzero in `L`.
     '''
-    def __init__(self, A):
+    def __init__(self, A, mode='auto'):
         LOGGER.debug(
             'Computing the Cholesky decomposition with %.2f%% nonzeros' %
             (100*A.nnz/(A.shape[0]*A.shape[1]),)
             )
+        self.mode = mode
         self.factor = cholmod.cholesky(
             A,
+            mode=mode,
             use_long=False,
             ordering_method='default'
             )
         # store the squared diagonal components of the cholesky factorization
         self.d = self.factor.D()
+        # the reciprocal square root of `d`, which is used to scale solutions
+        # in `solve_L`
+        self._s_inv = 1.0/np.sqrt(self.d)
+        # `d` does not change, so the log determinant is computed once
+        self._log_det = np.sum(np.log(self.d))
         # store the permutation array, which permutes `A` such that its
         # Cholesky factorization is maximally sparse
         self.p = self.factor.P()
@@ -240,14 +341,16 @@ class _SparsePosDefSolver:
         '''
         Solves `Lx = b` for `x`
         '''
-        s_inv = 1.0/np.sqrt(self.d)
+        s_inv = self._s_inv
         if b.ndim == 2:
             # expand for broadcasting
             s_inv = s_inv[:, None]
         elif b.ndim != 1:
             raise ValueError('`b` must be a 1 or 2 dimensional array')
 
-        out = s_inv*self.factor.solve_L(b[self.p])
+        # `solve_L` returns a new array, so it can be scaled in place
+        out = self.factor.solve_L(np.take(b, self.p, axis=0))
+        out *= s_inv
         return out
 
     def L(self):
@@ -259,29 +362,37 @@ class _SparsePosDefSolver:
 
     def log_det(self):
         '''Returns the log determinant of `A`'''
-        out = np.sum(np.log(self.d))
-        return out
+        return self._log_det
 
 
 class _DensePosDefSolver:
     '''
-    Dense positive definite matrix solver using LAPACK Cholesky decomposition
+    Dense positive definite matrix solver using LAPACK Cholesky decomposition.
+    If `dtype` is `np.float32`, then the decomposition is computed and stored
+    in single precision, and solutions are returned in double precision.
     '''
-    def __init__(self, A):
+    def __init__(self, A, dtype=float):
+        A = np.asarray(A, dtype=dtype)
         self.chol = _cholesky(A, lower=True)
 
-    def solve(self, b):
+    def solve(self, b, overwrite_b=False):
         '''
         Solves the equation `Ax = b` for `x`
         '''
-        return _solve_cholesky(self.chol, b, lower=True)
+        b = np.asarray(b, dtype=self.chol.dtype)
+        out = _solve_cholesky(self.chol, b, lower=True,
+                              overwrite_b=overwrite_b)
+        return out.astype(float, copy=False)
 
-    def solve_L(self, b):
+    def solve_L(self, b, overwrite_b=False):
         '''
         Solves the equation `Lx = b` for `x`, where `L` is the Cholesky
         decomposition.
         '''
-        return _solve_triangular(self.chol, b, lower=True)
+        b = np.asarray(b, dtype=self.chol.dtype)
+        out = _solve_triangular(self.chol, b, lower=True,
+                                overwrite_b=overwrite_b)
+        return out.astype(float, copy=False)
 
     def L(self):
         '''Returns the Cholesky decomposition of `A`'''
@@ -289,7 +400,8 @@ class _DensePosDefSolver:
 
     def log_det(self):
         '''Returns the log determinant of `A`'''
-        out = 2*np.sum(np.log(np.diag(self.chol)))
+        # `diagonal` returns a view rather than a copy
+        out = 2*np.sum(np.log(self.chol.diagonal(), dtype=float))
         return out
 
 
@@ -306,27 +418,43 @@ class PosDefSolver:
     A : (n, n) array or sparse matrix
         Positive definite matrix
 
+    build_inverse : bool, optional
+        Whether to use the inverse of `A` for solves. The inverse is built
+        lazily, once the total number of right-hand side columns passed to
+        `solve` reaches `n`, which is when building it pays for itself.
+
+    dtype : {float, np.float32}, optional
+        Precision used to compute and store a dense decomposition. Using
+        `np.float32` halves the memory and bandwidth needed for solves at the
+        cost of accuracy, which may be acceptable for well conditioned
+        matrices. Solutions are always returned in double precision. This is
+        ignored when `A` is sparse and CHOLMOD is available.
+
+    cholmod_mode : {'auto', 'simplicial', 'supernodal'}, optional
+        The CHOLMOD factorization mode to use when `A` is sparse. By default,
+        CHOLMOD chooses the mode based on a symbolic analysis of `A`.
+
     '''
-    def __init__(self, A, build_inverse=False):
+    def __init__(self, A, build_inverse=False, dtype=float,
+                 cholmod_mode='auto'):
         A = as_sparse_or_array(A, dtype=float)
         if sp.issparse(A):
             if not HAS_CHOLMOD:
                 warnings.warn(CHOLMOD_MSG)
-                self._solver = _DensePosDefSolver(A.toarray())
+                self._solver = _DensePosDefSolver(A.toarray(), dtype=dtype)
             else:
-                self._solver = _SparsePosDefSolver(A)
-
-        else:
-            self._solver = _DensePosDefSolver(A)
+                self._solver = _SparsePosDefSolver(A, mode=cholmod_mode)
 
-        if build_inverse:
-            I = np.eye(A.shape[0])
-            self._inverse = self._solver.solve(I)
         else:
-            self._inverse = None
+            self._solver = _DensePosDefSolver(A, dtype=dtype)
 
+        _init_lazy_inverse(self, build_inverse)
         self.n = A.shape[0]
 
+    def _make_inverse(self):
+        '''Builds the inverse of `A` from its Cholesky decomposition'''
+        return _inverse_from_factor(self._solver, self.n)
+
     def solve(self, b):
         '''
         solves `Ax = b` for `x`
@@ -341,6 +469,8 @@ class PosDefSolver:
 
         '''
         b = as_array(b, dtype=float)
+        _count_columns(self, b, self.n)
+
         if self._inverse is not None:
             return self._inverse.dot(b)
         else:
@@ -391,12 +521,65 @@ def is_positive_definite(A):
     Cholesky decomposition finishes successfully. `A` can be a sparse matrix or
     array.
     '''
-    try:
-        PosDefSolver(A).L()
-    except (np.linalg.LinAlgError, cholmod.CholmodNotPositiveDefiniteError):
-        return False
+    A = as_sparse_or_array(A, dtype=float)
+    if sp.issparse(A):
+        if HAS_CHOLMOD:
+            try:
+                cholmod.cholesky(A, use_long=False, ordering_method='default')
+            except cholmod.CholmodNotPositiveDefiniteError:
+                return False
+
+            return True
+
+        warnings.warn(CHOLMOD_MSG)
+        A = A.toarray()
+
+    if A.shape == (0, 0):
+        return True
+
+    # call `dpotrf` directly and check `info` rather than building a solver
+    _, info = dpotrf(A, lower=True)
+    if info < 0:
+        raise ValueError('The %s-th argument has an illegal value.' % -info)
+
+    return info == 0
+
 
-    return True
+def _sparse_saddle_point_matrix(A, B):
+    '''
+    Returns the CSC matrix `[[A, B], [B^T, 0]]` for the sparse (n, n) matrix
+    `A` and the dense (n, p) array `B`. The CSC arrays are built directly
+    rather than going through `sp.bmat`, which converts each block to COO
+    format and then converts the result back to CSC format.
+    '''
+    A = sp.csc_matrix(A)
+    n, p = B.shape
+    A_counts = np.diff(A.indptr)
+    # each of the first `n` columns contains a column of `A` followed by a
+    # column of `B^T`, and each of the last `p` columns is a column of `B`
+    indptr = np.empty(n + p + 1, dtype=np.int64)
+    indptr[0] = 0
+    np.cumsum(A_counts + p, out=indptr[1:n + 1])
+    indptr[n + 1:] = indptr[n] + n*np.arange(1, p + 1)
+    nnz = indptr[-1]
+    data = np.empty(nnz, dtype=float)
+    indices = np.empty(nnz, dtype=np.int64)
+    # positions of the entries from `A`, which are shifted by `p` for each
+    # preceding column
+    A_cols = np.repeat(np.arange(n), A_counts)
+    A_pos = np.arange(A.nnz) + p*A_cols
+    data[A_pos] = A.data
+    indices[A_pos] = A.indices
+    # positions of the entries from `B^T`, which end each of the first `n`
+    # columns
+    Bt_pos = (indptr[1:n + 1] - p)[:, None] + np.arange(p)
+    data[Bt_pos] = B
+    indices[Bt_pos] = n + np.arange(p)
+    # entries from `B`
+    data[indptr[n]:] = B.T.ravel()
+    indices[indptr[n]:] = np.tile(np.arange(n), p)
+    out = sp.csc_matrix((data, indices, indptr), shape=(n + p, n + p))
+    return out
 
 
 class PartitionedSolver:
@@ -435,6 +618,11 @@ class PartitionedSolver:
 
     B : (n, p) array or sparse matrix
 
+    build_inverse : bool, optional
+        Whether to use the inverse of the block matrix for solves. The inverse
+        is built lazily, once the total number of right-hand side columns
+        passed to `solve` reaches `n + p`.
+
     '''
     def __init__(self, A, B, build_inverse=False):
         A = as_sparse_or_array(A, dtype=float)
@@ -447,22 +635,26 @@ class PartitionedSolver:
               )
 
         if sp.issparse(A):
-            C = sp.bmat([[A, B], [B.T, None]], format='csc')
+            C = _sparse_saddle_point_matrix(A, B)
             self._solver = _SparseSolver(C)
         else:
-            Z = np.zeros((p, p), dtype=float)
-            C = np.block([[A, B], [B.T, Z]])
-            self._solver = _DenseSolver(C)
-
-        if build_inverse:
-            I = np.eye(n + p)
-            self._inverse = self._solver.solve(I)
-        else:
-            self._inverse = None
-
+            # build the system in a Fortran ordered array so that it can be
+            # factored in place by LAPACK
+            C = np.empty((n + p, n + p), dtype=float, order='F')
+            C[:n, :n] = A
+            C[:n, n:] = B
+            C[n:, :n] = B.T
+            C[n:, n:] = 0.0
+            self._solver = _DenseSolver(C, overwrite_a=True)
+
+        _init_lazy_inverse(self, build_inverse)
         self.n = n
         self.p = p
 
+    def _make_inverse(self):
+        '''Builds the inverse of the block matrix from its LU factorization'''
+        return _inverse_from_factor(self._solver, self.n + self.p)
+
     def solve(self, a, b=None):
         '''
         Solves for `x` and `y` given `a` and `b`.
@@ -482,19 +674,28 @@ class PartitionedSolver:
 
         '''
         a = as_array(a, dtype=float)
+        _count_columns(self, a, self.n + self.p)
+
         if self._inverse is not None:
             xy = self._inverse[:, :self.n].dot(a)
             if b is not None:
                 b = as_array(b, dtype=float)
                 xy += self._inverse[:, self.n:].dot(b)
         else:
+            # write `a` and `b` into one Fortran ordered array, which LAPACK
+            # can overwrite with the solution
+            c = np.empty((self.n + self.p,) + a.shape[1:], dtype=float,
+                         order='F')
+            c[:self.n] = a
             if b is None:
-                b = np.zeros((self.p,) + a.shape[1:], dtype=float)
+                c[self.n:] = 0.0
             else:
-                b = as_array(b, dtype=float)
+                c[self.n:] = as_array(b, dtype=float)
 
-            c = np.concatenate((a, b), axis=0)
-            xy = self._solver.solve(c)
+            if isinstance(self._solver, _DenseSolver):
+                xy = self._solver.solve(c, overwrite_b=True)
+            else:
+                xy = self._solver.solve(c)
 
         x, y = xy[:self.n], xy[self.n:]
         return x, y
@@ -559,6 +760,11 @@ class PartitionedPosDefSolver:
 
     B : (n, p) array or sparse matrix
 
+    build_inverse : bool, optional
+        Whether to use the inverse of the block matrix for solves. The inverse
+        is built lazily, once the total number of right-hand side columns
+        passed to `solve` and `solve_L` reaches `n + p`.
+
     Note
     ----
     This class stores the factorization of `A`, which may be sparse, the dense
@@ -586,22 +792,44 @@ class PartitionedPosDefSolver:
         else:
             self._A_solver = _DensePosDefSolver(A)
 
-        self._AiB = self._A_solver.solve(B)
-        self._BtAiB_solver = _DensePosDefSolver(B.T.dot(self._AiB))
-
-        if build_inverse:
-            Ia = np.eye(n)
-            Ib = np.eye(p)
-            E = -self._BtAiB_solver.solve(Ib)
-            D = self._AiB.dot(-E)
-            C = self._A_solver.solve(Ia) - D.dot(self._AiB.T)
-            self._inverse = np.block([[C, D], [D.T, E]])
+        if isinstance(self._A_solver, _DensePosDefSolver):
+            # `B^T A^-1 B = W^T W`, where `W = L^-1 B`. Computing it this way
+            # lets `dsyrk` exploit its symmetry, and `A^-1 B` is then found
+            # from `W` with one more triangular solve
+            W = self._A_solver.solve_L(B)
+            BtAiB = _gram_lower(W)
+            self._AiB = _solve_triangular(
+                self._A_solver.chol, W, lower=True, trans=True,
+                overwrite_b=True
+                )
         else:
-            self._inverse = None
+            self._AiB = self._A_solver.solve(B)
+            BtAiB = B.T.dot(self._AiB)
 
+        self._BtAiB_solver = _DensePosDefSolver(BtAiB)
+
+        _init_lazy_inverse(self, build_inverse)
         self.n = n
         self.p = p
 
+    def _make_inverse(self):
+        '''
+        Builds the inverse of the block matrix from the partitioned formulas,
+        writing each block directly into the output array.
+        '''
+        n, p = self.n, self.p
+        out = np.empty((n + p, n + p), dtype=float)
+        E = out[n:, n:]
+        E[...] = _inverse_from_factor(self._BtAiB_solver, p)
+        D = out[:n, n:]
+        D[...] = self._AiB.dot(E)
+        E *= -1.0
+        out[n:, :n] = D.T
+        C = out[:n, :n]
+        C[...] = _inverse_from_factor(self._A_solver, n)
+        C -= D.dot(self._AiB.T)
+        return out
+
     def solve(self, a, b=None):
         '''
         Solves for `x` and `y` given `a` and `b`.
@@ -620,6 +848,8 @@ class PartitionedPosDefSolver:
 
         '''
         a = as_array(a, dtype=float)
+        _count_columns(self, a, self.n + self.p)
+
         if self._inverse is not None:
             xy = self._inverse[:, :self.n].dot(a)
             if b is not None:
@@ -629,7 +859,11 @@ class PartitionedPosDefSolver:
             x, y = xy[:self.n], xy[self.n:]
 
         else:
-            Dta = self._BtAiB_solver.solve(self._AiB.T.dot(a))
+            # `AiB^T a` is a temporary, so compute it in Fortran order and let
+            # LAPACK overwrite it with the solution
+            Dta = self._BtAiB_solver.solve(
+                a.T.dot(self._AiB).T, overwrite_b=True
+                )
             Ca = self._A_solver.solve(a) - self._AiB.dot(Dta)
             if b is None:
                 x = Ca
@@ -643,6 +877,63 @@ class PartitionedPosDefSolver:
 
         return x, y
 
+    def solve_L(self, a, b=None):
+        '''
+        Computes the half solves `c` and `d` such that
+
+        .. math::
+            \\left[
+            \\begin{array}{c}
+                a \\\\
+                b \\\\
+            \\end{array}
+            \\right]^T
+            \\left[
+            \\begin{array}{cc}
+                A   & B \\\\
+                B^T & 0 \\\\
+            \\end{array}
+            \\right]^{-1}
+            \\left[
+            \\begin{array}{c}
+                a \\\\
+                b \\\\
+            \\end{array}
+            \\right]
+            = c^T c - d^T d.
+
+        This is done with one triangular solve for each of the factorizations
+        of `A` and `B^T A^-1 B`, which is cheaper than a full solve when only
+        the quadratic form is needed.
+
+        Parameters
+        ----------
+        a : (n, ...) array or sparse matrix
+
+        b : (p, ...) array or sparse matrix
+
+        Returns
+        -------
+        (n, ...) array
+
+        (p, ...) array
+
+        '''
+        a = as_array(a, dtype=float)
+        # the half solves do not use the inverse, but they count towards
+        # building it so that the inverse is available for `solve` once the
+        # factorization has been used heavily through either method
+        _count_columns(self, a, self.n + self.p)
+        c = self._A_solver.solve_L(a)
+        # `w` is a temporary, so compute it in Fortran order and let LAPACK
+        # overwrite it with the solution
+        w = a.T.dot(self._AiB).T
+        if b is not None:
+            w -= as_array(b, dtype=float)
+
+        d = self._BtAiB_solver.solve_L(w, overwrite_b=True)
+        return c, d
+
 
 class GMRESSolver:
     '''
@@ -700,21 +991,38 @@ class GMRESSolver:
         self.M = M
         self.n = n
 
-    def solve(self, b, tol=1.0e-10):
+    def solve(self, b, tol=1.0e-10, x0=None):
         '''
         Solve `Ax = b` for `x`
 
         Parameters
         ----------
-        b : (n,) array
+        b : (n,) or (n, k) array
+            If this has multiple columns, then each column is solved for in
+            turn, and the iterations for each column start from the solution
+            for the previous column. This is effective when the columns are
+            similar.
 
         tol : float, optional
 
+        x0 : (n,) array, optional
+            Initial guess for the solution, which is used for the first column
+            of `b`. Defaults to zeros.
+
         Returns
         -------
-        (n,) array
+        (n,) or (n, k) array
 
         '''
+        b = np.asarray(b, dtype=float)
+        if b.ndim == 2:
+            out = np.empty(b.shape, dtype=float)
+            for i in range(b.shape[1]):
+                out[:, i] = self.solve(b[:, i], tol=tol, x0=x0)
+                x0 = out[:, i]
+
+            return out
+
         # solve the system using GMRES and define the callback function to
         # print info for each iteration
         def callback(res, _itr=[0]):
@@ -726,6 +1034,7 @@ class GMRESSolver:
         x, info = spla.gmres(
             self.A,
             b/self.n,
+            x0=x0,
             tol=tol,
             M=self.M,
             callback=callback
@@ -10,7 +10,7 @@ import scipy.sparse as sp
 
 from rbf.basis import phs3, get_rbf
 from rbf.poly import monomial_count, monomial_powers, mvmonos
-from rbf.utils import assert_shape, KDTree
+from rbf.utils import assert_shape, KDTree, map_chunks
 from rbf.linalg import as_array
 
 logger = logging.getLogger(__name__)
@@ -146,9 +146,12 @@ def weights(x, s, diffs, coeffs=None, phi=phs3, order=None, eps=1.0):
     # the left-hand-side
     A = phi(s, s, eps=eps)
     P = mvmonos(s, pwr)
-    Pt = np.einsum('...ij->...ji', P)
-    Z = np.zeros(bcast + (len(pwr), len(pwr)), dtype=float)
-    LHS = np.block([[A, P], [Pt, Z]])
+    # write the blocks directly into one array rather than using np.block
+    nmonos = len(pwr)
+    LHS = np.zeros(bcast + (ssize + nmonos, ssize + nmonos), dtype=float)
+    LHS[..., :ssize, :ssize] = A
+    LHS[..., :ssize, ssize:] = P
+    LHS[..., ssize:, :ssize] = np.einsum('...ij->...ji', P)
     # Evaluate the RBF and monomials at the target points for each term in the
     # differential operator. This becomes the right-hand-side.
     a, p = 0.0, 0.0
@@ -170,7 +173,8 @@ def weight_matrix(x, p, n, diffs,
                   phi='phs3',
                   order=None,
                   eps=1.0,
-                  chunk_size=1000):
+                  chunk_size=1000,
+                  workers=None):
     '''
     Returns a weight matrix which maps a function's values at `p` to an
     approximation of that function's derivative at `x`. This is a convenience
@@ -219,6 +223,12 @@ def weight_matrix(x, p, n, diffs,
         Break the target points into chunks with this size to reduce the memory
         requirements
 
+    workers : int, optional
+        Number of threads used to compute the weights for the chunks. The
+        weights are mostly computed by numpy and LAPACK, which release the
+        GIL. By default, the chunks are processed serially. This has no effect
+        if `chunk_size` is None.
+
     Returns
     -------
     (N, M) coo sparse matrix
@@ -266,7 +276,9 @@ def weight_matrix(x, p, n, diffs,
             eps=eps)
     else:
         data = np.empty((nx, n), dtype=float)
-        for start in range(0, nx, chunk_size):
+
+        def compute_chunk(start):
+            # each chunk writes to a disjoint part of `data`
             stop = start + chunk_size
             data[start:stop] = weights(
                 x[start:stop], p[stencils[start:stop]], diffs,
@@ -275,6 +287,8 @@ def weight_matrix(x, p, n, diffs,
                 order=order,
                 eps=eps)
 
+        map_chunks(compute_chunk, nx, chunk_size, workers=workers)
+
     data = data.ravel()
     rows = np.repeat(range(nx), n)
     cols = stencils.ravel()
@@ -91,6 +91,7 @@ def _mvmonos(double[:, :] x, long[:, :] powers, long[:] diff):
         # number of positions where the monomials are evaluated
         long N = x.shape[0]
         long coeff, power
+        double c
         # `out` is the memoryview of the numpy array `out_array`
         double[:, :] out = out_array
 
@@ -101,15 +102,33 @@ def _mvmonos(double[:, :] x, long[:, :] powers, long[:] diff):
             for k in range(diff[i]):
                 coeff *= powers[j, i] - k
 
-            # if the monomial coefficient is zero then make sure the power
-            # is also zero to prevent a zero division error
+            # if the monomial coefficient is zero then the whole column is
+            # zero
             if coeff == 0:
-                power = 0
-            else:
-                power = powers[j, i] - diff[i]
+                for l in range(N):
+                    out[l, j] = 0.0
+
+                continue
+
+            power = powers[j, i] - diff[i]
+            c = coeff
+            # specialize the most common powers to avoid calls to `pow`
+            if power == 0:
+                if coeff != 1:
+                    for l in range(N):
+                        out[l, j] *= c
 
-            for l in range(N):
-                out[l, j] *= coeff*x[l, i]**power
+            elif power == 1:
+                for l in range(N):
+                    out[l, j] *= c*x[l, i]
+
+            elif power == 2:
+                for l in range(N):
+                    out[l, j] *= c*x[l, i]*x[l, i]
+
+            else:
+                for l in range(N):
+                    out[l, j] *= c*x[l, i]**power
 
     return out_array
 
@@ -3,6 +3,7 @@ import inspect
 import weakref
 from contextlib import contextmanager
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from scipy.spatial import cKDTree
@@ -132,6 +133,27 @@ def get_arg_count(func):
         return out
 
 
+def map_chunks(func, n, chunk_size, workers=None):
+    '''
+    Calls `func(start)` with the start index of each chunk when breaking
+    `range(n)` into chunks of size `chunk_size`. `func` should write its
+    results to disjoint parts of preallocated arrays.
+
+    If `workers` is greater than one, the chunks are processed with a pool of
+    that many threads. This is only beneficial if most of the work in `func`
+    is done by numpy or LAPACK, which release the GIL.
+    '''
+    starts = range(0, n, chunk_size)
+    if (workers is None) or (workers <= 1) or (len(starts) <= 1):
+        for start in starts:
+            func(start)
+
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # consume the iterator so that exceptions are raised
+            list(executor.map(func, starts))
+
+
 class Memoize(object):
     '''
     An memoizing decorator. The max cache size is hard-coded at 128. When the
@@ -161,27 +183,18 @@ class Memoize(object):
 
     def __call__(self, *args):
         key = self._as_key(args)
-        try:
-            value = self.cache[key]
+        if key in self.cache:
             # move the item to the end signifying that it was most recently
             # used
-            try:
-                # move_to_end is an attribute of OrderedDict in python 3. try
-                # calling it and if the attribute does not exist then fall back
-                # to the slow method
-                self.cache.move_to_end(key)
-
-            except AttributeError:
-                self.cache[key] = self.cache.pop(key)
-
-        except KeyError:
-            if len(self.cache) == self._MAXSIZE:
-                # remove the first item which is the least recently used item
-                self.cache.popitem(0)
-
-            value = self.fin(*args)
-            # add the function output to the end of the cache
-            self.cache[key] = value
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        value = self.fin(*args)
+        # add the function output to the end of the cache
+        self.cache[key] = value
+        if len(self.cache) > self._MAXSIZE:
+            # remove the first item which is the least recently used item
+            self.cache.popitem(last=False)
 
         return value
 
@@ -3,6 +3,9 @@ import rbf.poly
 import numpy as np
 import sympy
 import unittest
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from scipy.spatial.distance import cdist
 
 def test_positive_definite(phi, order=None, dim=2, ntests=100):
     # generate a random vector to test if the RBF is (conditionally) positive
@@ -167,4 +170,57 @@ class Test(unittest.TestCase):
         diff = np.abs(center_val - center_plus_dx_val)
         self.assertTrue(diff < 1.0e-4)
 
+  def test_sqdist_kernel(self):
+    # make sure the squared distance kernel agrees with the Gaussian RBF in
+    # low and high dimensions
+    eps = 2.0
+    coeff = rbf.basis._sqdist_coeff(rbf.basis.ga, eps)
+    for dim in [2, 20]:
+      x = np.random.random((30, dim))
+      c = np.random.random((20, dim))
+      val1 = rbf.basis._sqdist_kernel(x, c, coeff)
+      r = np.linalg.norm(x[:, None] - c[None, :], axis=-1)
+      val2 = np.exp(-(eps*r)**2)
+      self.assertTrue(np.allclose(val1, val2))
+
+    # make sure that precision is not lost for closely spaced points that
+    # are far from the origin
+    coeff = rbf.basis._sqdist_coeff(rbf.basis.ga, 0.01)
+    for offset in [1.0e2, 1.0e4]:
+      x = offset + 1.0e-2*np.random.random((30, 20))
+      c = offset + 1.0e-2*np.random.random((20, 20))
+      val1 = rbf.basis._sqdist_kernel(x, c, coeff)
+      val2 = np.exp(coeff*cdist(x, c, 'sqeuclidean'))
+      self.assertTrue(np.allclose(val1, val2, rtol=0.0, atol=1.0e-12))
+      # rounding error should never make squared distances negative
+      self.assertTrue(np.all(rbf.basis._sqdist(x, x).diagonal() >= 0.0))
+
+  def test_shared_numeric_functions(self):
+    # RBF instances with the same definition should share numeric functions,
+    # including copies made by pickling
+    r, eps = rbf.basis.get_r(), rbf.basis.get_eps()
+    phi1 = rbf.basis.RBF(sympy.exp(-(eps*r)**2))
+    phi2 = rbf.basis.RBF(sympy.exp(-(eps*r)**2))
+    x = np.random.random((5, 2))
+    val1 = phi1(x, x, diff=(1, 0))
+    phi3 = pickle.loads(pickle.dumps(phi1))
+    val2 = phi2(x, x, diff=(1, 0))
+    val3 = phi3(x, x, diff=(1, 0))
+    self.assertTrue(phi1._cache[(1, 0)] is phi2._cache[(1, 0)])
+    self.assertTrue(phi1._cache[(1, 0)] is phi3._cache[(1, 0)])
+    self.assertTrue(np.allclose(val1, val2))
+    self.assertTrue(np.allclose(val1, val3))
+
+  def test_threaded_numeric_functions(self):
+    # make sure that numeric functions can be created for an RBF from
+    # multiple threads at once
+    r, eps = rbf.basis.get_r(), rbf.basis.get_eps()
+    phi = rbf.basis.RBF(1/(1 + (eps*r)**2)**4)
+    x = np.random.random((5, 2))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+      vals = list(executor.map(lambda i: phi(x, x, diff=(1, 1)), range(8)))
+
+    for val in vals:
+      self.assertTrue(np.allclose(val, vals[0]))
+
 #unittest.main()
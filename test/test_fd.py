@@ -177,3 +177,13 @@ class Test(unittest.TestCase):
     w = rbf.pde.fd.weights(x,nodes,(0,1),
                        phi=rbf.basis.phs8)
     self.assertTrue(np.isclose(u.dot(w),diff_true,atol=1e-2))
+
+  def test_weight_matrix_workers(self):
+    # make sure computing the weights for the chunks with threads gives the
+    # same weight matrix as computing them serially
+    H = rbf.pde.halton.HaltonSequence(2)
+    x = H(200)
+    W1 = rbf.pde.fd.weight_matrix(x, x, 9, [[2, 0], [0, 2]], chunk_size=30)
+    W2 = rbf.pde.fd.weight_matrix(x, x, 9, [[2, 0], [0, 2]], chunk_size=30,
+                                  workers=4)
+    self.assertTrue(np.allclose(W1.toarray(), W2.toarray()))
@@ -1,6 +1,11 @@
 import numpy as np
+import scipy.sparse as sp
 import rbf.gproc
+import rbf.basis
+import rbf.linalg
 import unittest
+import time
+import warnings
 np.random.seed(1)
 
 def allclose(a,b,**kwargs):
@@ -81,6 +86,74 @@ class Test(unittest.TestCase):
     gp.sample([[0.0], [1.0], [2.0]])
     return 
 
+  def test_sample(self):
+    # compare seeded samples to samples drawn with a straightforward
+    # implementation. The covariance has a negative eigenvalue, which should
+    # be ignored
+    n = 10
+    mu = np.random.random((n,))
+    vecs, _ = np.linalg.qr(np.random.random((n, n)))
+    vals = np.linspace(-0.5, 2.0, n)
+    cov = (vecs*vals).dot(vecs.T)
+    vals, vecs = np.linalg.eigh(cov)
+    keep = vals > 0.0
+    for count in [None, 3]:
+      np.random.seed(2)
+      out1 = rbf.gproc.sample(mu, cov, count=count)
+      np.random.seed(2)
+      if count is None:
+        w = np.random.normal(0.0, np.sqrt(vals[keep]))
+        out2 = mu + vecs[:, keep].dot(w)
+      else:
+        scale = np.sqrt(vals[keep])[:, None].repeat(count, axis=1)
+        w = np.random.normal(0.0, scale)
+        out2 = (mu[:, None] + vecs[:, keep].dot(w)).T
+
+      self.assertTrue(np.allclose(out1, out2))
+
+    # the positive definite part of the covariance can be sampled with a
+    # cholesky decomposition
+    cov = (vecs*np.abs(vals)).dot(vecs.T)
+    L = np.linalg.cholesky(cov)
+    for count in [None, 3]:
+      np.random.seed(3)
+      out1 = rbf.gproc.sample(mu, cov, use_cholesky=True, count=count)
+      np.random.seed(3)
+      if count is None:
+        out2 = mu + L.dot(np.random.normal(0.0, 1.0, n))
+      else:
+        w = np.random.normal(0.0, 1.0, (n, count))
+        out2 = (mu[:, None] + L.dot(w)).T
+
+      self.assertTrue(np.allclose(out1, out2))
+
+  def test_outliers(self):
+    # make sure a planted outlier is found for dense and sparse covariances
+    np.random.seed(4)
+    x = np.linspace(0.0, 10.0, 50)[:, None]
+    gp = rbf.gproc.gpiso('wen11', var=1.0, eps=3.0) + rbf.gproc.gppoly(0)
+    dsigma = np.full(50, 0.1)
+    d = gp.sample(x) + np.random.normal(0.0, dsigma)
+    d[20] += 5.0
+    pcov = gp.covariance(x, x)
+    pvecs = gp.basis(x)
+    for cov in [pcov, sp.csc_matrix(pcov)]:
+      with warnings.catch_warnings():
+        # the sparse covariance is made dense if CHOLMOD is not available
+        warnings.simplefilter('ignore')
+        out = rbf.gproc.outliers(d, dsigma, cov, pvecs=pvecs)
+
+      expected = np.zeros(50, dtype=bool)
+      expected[20] = True
+      self.assertTrue(np.all(out == expected))
+
+    # the `GaussianProcess` method should give the same result
+    with warnings.catch_warnings():
+      warnings.simplefilter('ignore')
+      out = gp.outliers(x, d, dsigma)
+
+    self.assertTrue(np.all(out == expected))
+
   def test_run_is_positive_definite(self):
     # make sure the is_positive_definite method runs without failure 
     gp = rbf.gproc.gpiso('se', var=1.0, eps=1.0)
@@ -107,6 +180,55 @@ class Test(unittest.TestCase):
     #plt.plot(x,test_func1d(x),'k-')
     #plt.show()
 
+  def test_condition_build_inverse(self):
+    # make sure conditioning with `build_inverse` gives the same posterior as
+    # without it, including after the inverse has been built
+    y = np.random.random((10, 2))
+    d = np.random.random((10,))
+    dvecs = y[:, :1]**2
+    x = np.random.random((30, 2))
+    gp = rbf.gproc.gpiso('se', var=1.0, eps=0.5) + rbf.gproc.gppoly(1)
+    gp1 = gp.condition(y, d, dcov=1e-2*np.eye(10), dvecs=dvecs)
+    gp2 = gp.condition(y, d, dcov=1e-2*np.eye(10), dvecs=dvecs,
+                       build_inverse=True)
+    for i in range(2):
+      mu1, sigma1 = gp1(x)
+      mu2, sigma2 = gp2(x)
+      self.assertTrue(np.allclose(mu1, mu2))
+      self.assertTrue(np.allclose(sigma1, sigma2))
+      cov1 = gp1.covariance(x, x[:5])
+      cov2 = gp2.covariance(x, x[:5])
+      self.assertTrue(np.allclose(cov1, cov2))
+
+  def test_condition_build_inverse_workers(self):
+    # make sure the inverse is only built once when a conditioned process is
+    # evaluated with multiple threads
+    cls = rbf.linalg.PartitionedPosDefSolver
+    make_inverse = cls._make_inverse
+    builds = []
+    def counting_make_inverse(self):
+      builds.append(None)
+      # give the other threads a chance to try building the inverse
+      time.sleep(0.1)
+      return make_inverse(self)
+
+    y = np.random.random((20, 2))
+    d = np.random.random((20,))
+    x = np.random.random((400, 2))
+    gp = rbf.gproc.gpiso('se', var=1.0, eps=0.5) + rbf.gproc.gppoly(1)
+    gp1 = gp.condition(y, d, dcov=1e-2*np.eye(20))
+    gp2 = gp.condition(y, d, dcov=1e-2*np.eye(20), build_inverse=True)
+    cls._make_inverse = counting_make_inverse
+    try:
+      mu2, sigma2 = gp2(x, chunk_size=10, workers=8)
+    finally:
+      cls._make_inverse = make_inverse
+
+    mu1, sigma1 = gp1(x, chunk_size=10)
+    self.assertEqual(len(builds), 1)
+    self.assertTrue(np.allclose(mu1, mu2))
+    self.assertTrue(np.allclose(sigma1, sigma2))
+
   def test_condition_and_differentiate(self):  
     # make sure that condition produces an accurate estimate of the 
     # derivative
@@ -248,4 +370,81 @@ class Test(unittest.TestCase):
     var1 = gp.variance(x)
     var2 = gp.covariance(x, x).diagonal()
     self.assertTrue(np.allclose(var1, var2))
-  
+
+  def test_variance_3(self):
+    # make sure the variance is equal to the covariance diagonal when adding
+    # a GP with a variance function to a GP without one
+    x = np.random.random((3, 1))
+    def cov(x1, x2):
+      return np.exp(-(x1[:, None, 0] - x2[None, :, 0])**2)
+
+    gp = rbf.gproc.gpiso('se', var=1.0, eps=1.0)
+    gp += rbf.gproc.GaussianProcess(covariance=cov)
+    var1 = gp.variance(x)
+    var2 = gp.covariance(x, x).diagonal()
+    self.assertTrue(np.allclose(var1, var2))
+
+  def test_variance_4(self):
+    # make sure the variance is equal to the covariance diagonal for the
+    # Gibbs GP
+    x = np.random.random((3, 1))
+    gp = rbf.gproc.gpgibbs(lambda x: 0.5 + x, 2.0)
+    var1 = gp.variance(x)
+    var2 = gp.covariance(x, x).diagonal()
+    self.assertTrue(np.allclose(var1, var2))
+    var1 = gp.variance(x, (1,))
+    var2 = gp.covariance(x, x, (1,), (1,)).diagonal()
+    self.assertTrue(np.allclose(var1, var2))
+
+  def test_squared_exponential_covariance(self):
+    # make sure the covariance for the squared exponential and Gaussian
+    # isotropic GPs is consistent with their RBFs
+    x1 = np.random.random((4, 2))
+    x2 = np.random.random((3, 2))
+    for phi in ['se', 'ga']:
+      gp = rbf.gproc.gpiso(phi, var=2.0, eps=0.5)
+      cov1 = gp.covariance(x1, x2)
+      cov2 = 2.0*rbf.basis.get_rbf(phi)(x1, x2, eps=0.5)
+      self.assertTrue(np.allclose(cov1, cov2))
+
+  def test_trivial_arithmetic(self):
+    # make sure that scaling by one or zero and adding an empty GP give the
+    # expected processes
+    x = np.random.random((5, 1))
+    gp = rbf.gproc.gpiso('se', var=2.0, eps=0.5) + rbf.gproc.gppoly(1)
+    self.assertIs(gp*1.0, gp)
+    self.assertIs(gp + rbf.gproc.GaussianProcess(), gp)
+    self.assertIs(rbf.gproc.GaussianProcess() + gp, gp)
+    gp0 = gp*0.0
+    self.assertTrue(np.all(gp0.mean(x) == 0.0))
+    self.assertTrue(np.all(gp0.covariance(x, x) == 0.0))
+    self.assertTrue(np.allclose(gp0.basis(x), gp.basis(x)))
+
+  def test_call_workers(self):
+    # make sure evaluating the chunks with threads gives the same result as
+    # evaluating them serially
+    y = np.random.random((20, 2))
+    d = np.random.random((20,))
+    x = np.random.random((250, 2))
+    gp = rbf.gproc.gpiso('se', var=1.0, eps=0.5) + rbf.gproc.gppoly(1)
+    gp = gp.condition(y, d, dcov=1e-2*np.eye(20))
+    mu1, sigma1 = gp(x, chunk_size=30)
+    mu2, sigma2 = gp(x, chunk_size=30, workers=4)
+    self.assertTrue(np.allclose(mu1, mu2))
+    self.assertTrue(np.allclose(sigma1, sigma2))
+
+  def test_call_workers_first(self):
+    # make sure evaluating with threads works when the numeric functions for
+    # the RBF have not been created yet. The RBF is made here so that no
+    # other test has compiled its derivatives
+    r, eps = rbf.basis.get_r(), rbf.basis.get_eps()
+    phi = rbf.basis.RBF(1/(1 + (eps*r)**2)**3)
+    y = np.random.random((20, 2))
+    d = np.random.random((20,))
+    x = np.random.random((100, 2))
+    gp = rbf.gproc.gpiso(phi, var=1.0, eps=0.5)
+    gp = gp.condition(y, d, dcov=1e-2*np.eye(20)).differentiate((1, 0))
+    mu1, sigma1 = gp(x, chunk_size=10, workers=8)
+    mu2, sigma2 = gp(x, chunk_size=10)
+    self.assertTrue(np.allclose(mu1, mu2))
+    self.assertTrue(np.allclose(sigma1, sigma2))
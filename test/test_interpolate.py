@@ -162,6 +162,79 @@ class Test(unittest.TestCase):
     valitp_true = test_func2d(itp)
     self.assertTrue(np.allclose(valitp_est,valitp_true,atol=1e-2))
 
+  def test_pos_def(self):
+    # make sure the RBFInterpolant works with positive definite RBFs, which
+    # are solved with a Cholesky decomposition
+    N = 200
+    P = 200
+    H = rbf.pde.halton.HaltonSequence(2)
+    obs = H(N)
+    itp = H(P)
+    val = test_func2d(obs)
+    I = rbf.interpolate.RBFInterpolant(obs,val,
+                                       phi=rbf.basis.ga,order=1,
+                                       eps=5.0)
+    valitp_est = I(itp)
+    valitp_true = test_func2d(itp)
+    self.assertTrue(np.allclose(valitp_est,valitp_true,atol=1e-2))
+
+  def test_multiple_data(self):
+    # make sure that interpolating multidimensional data gives the same
+    # result as interpolating each component separately
+    N = 50
+    P = 20
+    H = rbf.pde.halton.HaltonSequence(2)
+    obs = H(N)
+    itp = H(P)
+    val = np.random.random((N, 2, 3))
+    for phi in ['phs3', 'ga']:
+      I = rbf.interpolate.RBFInterpolant(obs,val,phi=phi,order=1,eps=5.0)
+      valitp = I(itp)
+      self.assertEqual(valitp.shape, (P, 2, 3))
+      for i in range(2):
+        for j in range(3):
+          Iij = rbf.interpolate.RBFInterpolant(obs,val[:,i,j],phi=phi,
+                                               order=1,eps=5.0)
+          self.assertTrue(np.allclose(valitp[:,i,j],Iij(itp)))
+
+  def test_no_polynomial_terms(self):
+    # make sure the interpolant can be evaluated without polynomial terms,
+    # for scalar, multidimensional, and empty data
+    N = 50
+    P = 20
+    H = rbf.pde.halton.HaltonSequence(2)
+    obs = H(N)
+    itp = H(P)
+    val = np.random.random((N, 2))
+    I = rbf.interpolate.RBFInterpolant(obs, val, phi='ga', order=-1, eps=5.0)
+    valitp = I(itp)
+    self.assertEqual(valitp.shape, (P, 2))
+    for i in range(2):
+      Ii = rbf.interpolate.RBFInterpolant(obs, val[:, i], phi='ga', order=-1,
+                                          eps=5.0)
+      self.assertEqual(Ii(itp).shape, (P,))
+      self.assertTrue(np.allclose(valitp[:, i], Ii(itp)))
+
+    I = rbf.interpolate.RBFInterpolant(obs, np.zeros((N, 0)), phi='ga',
+                                       eps=5.0)
+    self.assertEqual(I(itp).shape, (P, 0))
+
+  def test_k_nearest_multiple_data(self):
+    # same as above, but for the k-nearest neighbors interpolant
+    N = 50
+    P = 20
+    H = rbf.pde.halton.HaltonSequence(2)
+    obs = H(N)
+    itp = H(P)
+    val = np.random.random((N, 2, 3))
+    I = rbf.interpolate.KNearestRBFInterpolant(obs, val, k=10)
+    valitp = I(itp)
+    self.assertEqual(valitp.shape, (P, 2, 3))
+    for i in range(2):
+      for j in range(3):
+        Iij = rbf.interpolate.KNearestRBFInterpolant(obs, val[:, i, j], k=10)
+        self.assertTrue(np.allclose(valitp[:, i, j], Iij(itp)))
+
 #unittest.main()    
     
 
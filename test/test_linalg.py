@@ -125,6 +125,60 @@ class Test(unittest.TestCase):
     soln2 = solver2.solve(d)
     self.assertTrue(np.allclose(soln1,soln2))
 
+  def test_solver_lazy_inverse(self):
+    # the inverse is built once enough right-hand sides have been solved.
+    # Make sure the solutions are the same before and after it is built
+    A = np.random.random((4, 4))
+    A = A.T.dot(A) + np.eye(4)
+    for cls in [rbf.linalg.Solver, rbf.linalg.PosDefSolver]:
+      solver1 = cls(A, build_inverse=False)
+      solver2 = cls(A, build_inverse=True)
+      for i in range(6):
+        d = np.random.random((4,))
+        soln1 = solver1.solve(d)
+        soln2 = solver2.solve(d)
+        self.assertTrue(np.allclose(soln1,soln2))
+
+      self.assertIsNone(solver1._inverse)
+      self.assertIsNotNone(solver2._inverse)
+
+  def test_partitioned_solver_lazy_inverse(self):
+    # make sure the partitioned solvers give the same solutions before and
+    # after the inverse is built
+    A = np.random.random((4, 4))
+    A = A.T.dot(A) + np.eye(4)
+    B = np.random.random((4, 2))
+    for cls in [rbf.linalg.PartitionedSolver,
+                rbf.linalg.PartitionedPosDefSolver]:
+      solver1 = cls(A, B, build_inverse=False)
+      solver2 = cls(A, B, build_inverse=True)
+      for i in range(8):
+        a = np.random.random((4,))
+        b = np.random.random((2,))
+        soln1a, soln1b = solver1.solve(a, b)
+        soln2a, soln2b = solver2.solve(a, b)
+        self.assertTrue(np.allclose(soln1a, soln2a))
+        self.assertTrue(np.allclose(soln1b, soln2b))
+
+      self.assertIsNotNone(solver2._inverse)
+
+  def test_partitioned_solver_lazy_inverse_solve_L(self):
+    # the columns passed to `solve_L` should count towards building the
+    # inverse
+    A = np.random.random((4, 4))
+    A = A.T.dot(A) + np.eye(4)
+    B = np.random.random((4, 2))
+    solver1 = rbf.linalg.PartitionedPosDefSolver(A, B, build_inverse=False)
+    solver2 = rbf.linalg.PartitionedPosDefSolver(A, B, build_inverse=True)
+    solver2.solve_L(np.random.random((4, 6)), np.random.random((2, 6)))
+    self.assertIsNotNone(solver2._inverse)
+    a = np.random.random((4,))
+    b = np.random.random((2,))
+    soln1a, soln1b = solver1.solve(a, b)
+    soln2a, soln2b = solver2.solve(a, b)
+    self.assertTrue(np.allclose(soln1a, soln2a))
+    self.assertTrue(np.allclose(soln1b, soln2b))
+
   def test_pos_def_solver_dense_build_inv(self):
     A = np.random.random((4, 4))
     A = A.T.dot(A)
@@ -135,6 +189,32 @@ class Test(unittest.TestCase):
     soln2 = solver2.solve(d)
     self.assertTrue(np.allclose(soln1,soln2))
   
+  def test_pos_def_solver_dense_float32(self):
+    # a single precision decomposition should give solutions that agree with
+    # the double precision solutions to single precision accuracy
+    A = np.random.random((10, 10))
+    A = A.T.dot(A) + 10*np.eye(10)
+    d = np.random.random((10, 2))
+    solver1 = rbf.linalg.PosDefSolver(A)
+    solver2 = rbf.linalg.PosDefSolver(A, dtype=np.float32)
+    self.assertEqual(solver2.L().dtype, np.float32)
+    soln1 = solver1.solve(d)
+    soln2 = solver2.solve(d)
+    self.assertEqual(soln2.dtype, np.float64)
+    self.assertTrue(np.allclose(soln1, soln2, rtol=1e-5, atol=1e-6))
+    soln1 = solver1.solve_L(d)
+    soln2 = solver2.solve_L(d)
+    self.assertTrue(np.allclose(soln1, soln2, rtol=1e-5, atol=1e-6))
+    self.assertTrue(np.isclose(solver1.log_det(), solver2.log_det()))
+
+  def test_is_positive_definite(self):
+    A = np.random.random((4, 4))
+    A = A.T.dot(A) + np.eye(4)
+    self.assertTrue(rbf.linalg.is_positive_definite(A))
+    self.assertTrue(rbf.linalg.is_positive_definite(sp.csc_matrix(A)))
+    self.assertFalse(rbf.linalg.is_positive_definite(-A))
+    self.assertFalse(rbf.linalg.is_positive_definite(sp.csc_matrix(-A)))
+
   def test_partitioned_solver_dense(self):    
     A = np.random.random((4,4))
     A = A.T + A # A is now symmetric
@@ -199,6 +279,35 @@ class Test(unittest.TestCase):
     soln2 = Cinv.dot(np.hstack((a,b)))
     self.assertTrue(np.allclose(soln1,soln2))
 
+  def test_partitioned_solver_dense_pos_def_solve_L(self):
+    A = np.random.random((6,6))
+    A = A.T.dot(A) + np.eye(6) # A is now P.D.
+    B = np.random.random((6,2))
+    a = np.random.random((6,3))
+    b = np.random.random((2,3))
+    Cfact = rbf.linalg.PartitionedPosDefSolver(A,B)
+    c,d = Cfact.solve_L(a,b)
+    soln1 = c.T.dot(c) - d.T.dot(d)
+    Cinv = np.linalg.inv(
+             np.vstack(
+               (np.hstack((A,B)),
+                np.hstack((B.T,np.zeros((2,2)))))))
+    ab = np.vstack((a,b))
+    soln2 = ab.T.dot(Cinv).dot(ab)
+    self.assertTrue(np.allclose(soln1,soln2))
+
+  def test_gmres_solver_multiple_columns(self):
+    # make sure that solving multiple columns with warm starts gives the
+    # same solutions as solving each column separately
+    A = sp.random(50, 50, density=0.1, format='csc') + 10*sp.eye(50)
+    b = np.random.random((50, 3))
+    solver = rbf.linalg.GMRESSolver(A)
+    soln1 = solver.solve(b)
+    soln2 = np.array([solver.solve(b[:, i]) for i in range(3)]).T
+    soln3 = np.linalg.solve(A.toarray(), b)
+    self.assertTrue(np.allclose(soln1, soln2))
+    self.assertTrue(np.allclose(soln1, soln3))
+
   def test_partitioned_solver_sparse(self):    
     A = np.random.random((4,4))
     A = A.T + A # A is now symmetric
@@ -0,0 +1,50 @@
+import numpy as np
+import rbf.poly
+import unittest
+from math import factorial
+from itertools import product
+
+def mvmonos_reference(x, powers, diff):
+  # evaluates the differentiated monomials with numpy
+  out = np.ones((x.shape[0], powers.shape[0]))
+  for j, pows in enumerate(powers):
+    for i, (p, k) in enumerate(zip(pows, diff)):
+      if k > p:
+        out[:, j] = 0.0
+      else:
+        coeff = factorial(p)/factorial(p - k)
+        out[:, j] *= coeff*x[:, i]**(p - k)
+
+  return out
+
+class Test(unittest.TestCase):
+  def test_mvmonos(self):
+    x = np.random.uniform(-2.0, 2.0, (10, 2))
+    powers = np.array([[0, 0], [1, 0], [0, 2], [1, 2], [3, 1], [4, 0]])
+    out1 = rbf.poly.mvmonos(x, powers)
+    out2 = mvmonos_reference(x, powers, (0, 0))
+    self.assertTrue(np.allclose(out1, out2))
+
+  def test_mvmonos_diff(self):
+    # check every combination of a derivative that exceeds the power (zero
+    # coefficient), equals the power (a constant coefficient that is not 1
+    # for powers above 1), and is less than the power (powers of 1, 2, and 3
+    # or more remaining)
+    x = np.random.uniform(-2.0, 2.0, (10, 2))
+    powers = np.array([[0, 0], [1, 0], [0, 2], [1, 2], [3, 1], [4, 0],
+                       [2, 3], [5, 4]])
+    for diff in product(range(6), range(5)):
+      out1 = rbf.poly.mvmonos(x, powers, diff=diff)
+      out2 = mvmonos_reference(x, powers, diff)
+      self.assertTrue(np.allclose(out1, out2))
+
+  def test_mvmonos_degree_diff(self):
+    # same as above, but with the monomials specified by their degree
+    x = np.random.uniform(-2.0, 2.0, (10, 3))
+    powers = rbf.poly.monomial_powers(4, 3)
+    for diff in [(0, 0, 0), (1, 0, 0), (2, 1, 0), (0, 3, 1), (4, 0, 0)]:
+      out1 = rbf.poly.mvmonos(x, 4, diff=diff)
+      out2 = mvmonos_reference(x, powers, diff)
+      self.assertTrue(np.allclose(out1, out2))
+
+#unittest.main()
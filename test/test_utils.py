@@ -83,6 +83,52 @@ class Test(unittest.TestCase):
     # clear the cache and make sure the cache size goes back to zero
     rbf.utils.clear_memoize_caches()
     self.assertTrue(len(memfunc.cache) == 0)
+
+  def test_memoize_lru(self):
+    calls = []
+    def func(a):
+      calls.append(a)
+      return a
+
+    memfunc = rbf.utils.Memoize(func)
+    for i in range(128):
+      memfunc(i)
+
+    # calling with 0 should make it the most recently used item, so that 1
+    # is the item that gets dropped when the cache is full
+    memfunc(0)
+    memfunc(128)
+    self.assertTrue(len(calls) == 129)
+    self.assertTrue((0,) in memfunc.cache)
+    self.assertTrue((1,) not in memfunc.cache)
+
+  def test_map_chunks(self):
+    # make sure each chunk is processed once, with and without threads
+    for workers in [None, 4]:
+      out = np.zeros(103, dtype=int)
+      def func(start):
+        out[start:start + 10] += 1
+
+      rbf.utils.map_chunks(func, 103, 10, workers=workers)
+      self.assertTrue(np.all(out == 1))
+
+  def test_memoize_array_input_keys(self):
+    def func(a):
+      return a.sum()
+
+    memfunc = rbf.utils.MemoizeArrayInput(func)
+    # arrays with the same data but different shapes should be cached
+    # separately
+    arr = np.arange(6.0)
+    memfunc(arr)
+    memfunc(arr.reshape((2, 3)))
+    self.assertTrue(len(memfunc.cache) == 2)
+
+    # non-contiguous arrays should be cached the same as their contiguous
+    # copies
+    memfunc(arr.reshape((3, 2)).T)
+    memfunc(np.array(arr.reshape((3, 2)).T))
+    self.assertTrue(len(memfunc.cache) == 3)
       
 
     